@@ -6,19 +6,79 @@ USE ONLY ON YOUR OWN NETWORKS OR WITH EXPLICIT PERMISSION
 
 import socket
 import subprocess
-import threading
 import ipaddress
+import asyncio
+import random
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 
+from port_scanner import raise_fd_limit
+
+# Ports checked on every live host
+COMMON_PORTS = [21, 22, 23, 25, 53, 80, 110, 135, 139, 143, 443, 993, 995, 3389]
+
+# Ports knocked on at once by the TCP liveness probe: any answer, even a refusal, means "alive"
+LIVENESS_PORTS = [80, 443, 22, 445, 3389]
+
+# Kernel neighbour table (Linux): hosts on the local segment that answered ARP
+ARP_TABLE = "/proc/net/arp"
+ARP_COMPLETE = 0x2
+
+# Step of the scattered host order, as a share of the network size (golden ratio)
+SCATTER_STEP = 0.618
+
+
+def read_arp_table(path=ARP_TABLE):
+    """IPs with a complete entry in the ARP table (empty set where there is none)"""
+    try:
+        with open(path, 'r') as f:
+            next(f, None)  # header line
+            entries = [line.split() for line in f]
+    except OSError:
+        return set()
+    return {fields[0] for fields in entries
+            if len(fields) >= 4 and int(fields[2], 16) & ARP_COMPLETE}
+
+
+def iter_hosts(network, scatter=False, seed=None):
+    """
+    Yield the hosts of network lazily - nothing is built up front, however
+    large the network. With scatter, each host is still visited exactly
+    once, but consecutive probes land far apart (index * step + offset
+    modulo the network size, with an odd step near size * SCATTER_STEP), so
+    no subnet takes a burst. Not a cryptographic shuffle.
+    """
+    if not scatter:
+        yield from network.hosts()
+        return
+    size = network.num_addresses  # a power of two, so any odd step visits every index once
+    rng = random.Random(seed)
+    jitter = size // 32
+    step = max(1, int(size * SCATTER_STEP) + rng.randint(-jitter, jitter)) | 1
+    offset = rng.randrange(size)
+    first = int(network.network_address)
+    skip_edges = network.prefixlen < network.max_prefixlen - 1  # as network.hosts()
+    for i in range(size):
+        index = (offset + i * step) % size
+        if skip_edges and index in (0, size - 1):
+            continue
+        yield ipaddress.IPv4Address(first + index)
+
+
 class NetworkDiscovery:
-    def __init__(self, network, threads=50, timeout=3):
+    def __init__(self, network, threads=50, timeout=3, method="tcp", concurrency=256,
+                 scatter=False, seed=None):
         self.network = network
         self.threads = threads
         self.timeout = timeout
+        self.method = method            # "tcp" (in-process connects + ARP) or "ping" (subprocess)
+        self.concurrency = concurrency  # hosts probed at once by the TCP sweep
+        self.scatter = scatter          # visit hosts in a scattered order (see iter_hosts)
+        self.seed = seed
         self.alive_hosts = []
+        self.alive_via = {}             # ip -> how it answered ("arp", "tcp/22", "ping")
         self.host_info = {}
         
     def ping_host(self, ip):
@@ -48,6 +108,51 @@ class NetworkDiscovery:
         except (subprocess.TimeoutExpired, Exception):
             return None
     
+    async def knock(self, ip, port, timeout=None):
+        """Non-blocking connect: "open", "closed" (refused - the host is up) or None"""
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+            return "open"
+        except ConnectionRefusedError:
+            return "closed"  # a RST comes from a live host
+        except (OSError, asyncio.TimeoutError):
+            return None  # unreachable, no route, no answer...
+        finally:
+            sock.close()
+    
+    async def tcp_alive(self, ip):
+        """
+        Knock on LIVENESS_PORTS at once; the host is alive as soon as any of
+        them accepts or refuses. Returns the answering port, or None.
+        """
+        knocks = {asyncio.ensure_future(self.knock(ip, port)): port for port in LIVENESS_PORTS}
+        pending = set(knocks)
+        deadline = time.monotonic() + self.timeout
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for knock in done:
+                    if knock.result():
+                        return knocks[knock]
+            return None
+        finally:
+            for knock in pending:
+                knock.cancel()
+            if pending:
+                await asyncio.wait(pending)
+    
+    async def probe_common_ports(self, ip):
+        """Check COMMON_PORTS all at once (1s connect timeout each)"""
+        states = await asyncio.gather(*(self.knock(ip, port, timeout=1) for port in COMMON_PORTS))
+        return [port for port, state in zip(COMMON_PORTS, states) if state == "open"]
+    
     def get_hostname(self, ip):
         """Try to get hostname for IP"""
         try:
@@ -56,23 +161,101 @@ class NetworkDiscovery:
         except:
             return "Unknown"
     
-    def check_common_ports(self, ip):
-        """Check common ports on a host"""
-        common_ports = [21, 22, 23, 25, 53, 80, 110, 135, 139, 143, 443, 993, 995, 3389]
-        open_ports = []
-        
-        for port in common_ports:
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                result = sock.connect_ex((str(ip), port))
-                if result == 0:
-                    open_ports.append(port)
-                sock.close()
-            except:
-                pass
-        
-        return open_ports
+    async def host_details(self, ip, dns_pool):
+        """Reverse DNS (in a thread) and the common port checks of one live host, side by side"""
+        loop = asyncio.get_running_loop()
+        hostname, ports = await asyncio.gather(
+            loop.run_in_executor(dns_pool, self.get_hostname, ip),
+            self.probe_common_ports(ip)
+        )
+        
+        self.host_info[ip] = {
+            'hostname': hostname,
+            'open_ports': ports
+        }
+        
+        print(f"📋 {ip}")
+        print(f"   Hostname: {hostname}")
+        if ports:
+            print(f"   Open ports: {', '.join(map(str, ports))}")
+        else:
+            print(f"   Open ports: None found")
+        print()
+    
+    async def discover(self, network):
+        """
+        Pipelined discovery: the liveness sweep runs while every host it
+        confirms goes straight on to reverse DNS and port checks, so the
+        stages overlap instead of running one after another. Hosts in the
+        ARP table are alive for free; the others get TCP knocks (or a
+        ping). After the sweep the ARP table is read again - our connects
+        made the kernel ARP for local hosts, so firewalled ones show up
+        there too.
+        
+        Memory stays flat whatever the prefix length: a fixed number of
+        sweepers pull hosts one at a time from a shared lazy iterator, and
+        a sweeper waits while the details stage is full.
+        """
+        loop = asyncio.get_running_loop()
+        # Sockets per host: the liveness knocks, then the common port checks
+        sockets = raise_fd_limit(self.concurrency * (len(LIVENESS_PORTS) + len(COMMON_PORTS)))
+        hosts_at_once = max(1, min(self.concurrency,
+                                   sockets // (len(LIVENESS_PORTS) + len(COMMON_PORTS))))
+        detail_slots = asyncio.Semaphore(hosts_at_once)
+        ping_pool = ThreadPoolExecutor(max_workers=self.threads) if self.method == "ping" else None
+        dns_pool = ThreadPoolExecutor(max_workers=self.threads)
+        hosts = iter_hosts(network, self.scatter, self.seed)
+        details = set()
+        
+        def arp_hosts():
+            return {ip for ip in read_arp_table() if ipaddress.ip_address(ip) in network}
+        
+        def details_done(task):
+            details.discard(task)
+            detail_slots.release()
+        
+        async def alive(ip, via):
+            self.alive_hosts.append(ip)
+            self.alive_via[ip] = via
+            print(f"✅ Host alive: {ip} ({via})")
+            await detail_slots.acquire()
+            task = asyncio.create_task(self.host_details(ip, dns_pool))
+            details.add(task)
+            task.add_done_callback(details_done)
+        
+        async def is_alive(ip):
+            """How the host answered, or None"""
+            if ip in arp:
+                return "arp"
+            if ping_pool:
+                result = await loop.run_in_executor(ping_pool, self.ping_host, ip)
+                return "ping" if result else None
+            port = await self.tcp_alive(ip)
+            return f"tcp/{port}" if port else None
+        
+        async def sweeper():
+            for address in hosts:  # shared: each sweeper takes the next host
+                ip = str(address)
+                via = await is_alive(ip)
+                if via:
+                    await alive(ip, via)
+        
+        try:
+            arp = arp_hosts()
+            await asyncio.gather(*(sweeper() for _ in range(hosts_at_once)))
+            
+            for ip in sorted(arp_hosts() - set(self.alive_hosts), key=ipaddress.ip_address):
+                await alive(ip, "arp")
+            
+            pending = sum(not task.done() for task in details)
+            if pending:
+                print(f"🔍 Sweep done, {len(self.alive_hosts)} alive - "
+                      f"finishing details for {pending} hosts...")
+            await asyncio.gather(*list(details))
+        finally:
+            dns_pool.shutdown(wait=False)
+            if ping_pool:
+                ping_pool.shutdown(wait=False)
     
     def scan_network(self):
         """Main network scanning function"""
@@ -84,48 +267,19 @@ class NetworkDiscovery:
         
         print(f"🌐 Scanning network: {network}")
         print(f"📊 Host range: {network.network_address} - {network.broadcast_address}")
-        print(f"⚡ Threads: {self.threads}, Timeout: {self.timeout}s")
-        print(f"🎯 Checking {network.num_addresses} addresses...")
+        if self.method == "ping":
+            print(f"⚡ Ping sweep - Threads: {self.threads}, Timeout: {self.timeout}s")
+        else:
+            print(f"⚡ TCP/ARP sweep - {self.concurrency} hosts at once on ports "
+                  f"{', '.join(map(str, LIVENESS_PORTS))}, Timeout: {self.timeout}s")
+        order = " in scattered order" if self.scatter else ""
+        print(f"🎯 Checking {network.num_addresses:,} addresses{order}...")
         print("-" * 60)
         
-        # Ping sweep
-        with ThreadPoolExecutor(max_workers=self.threads) as executor:
-            futures = {executor.submit(self.ping_host, ip): ip for ip in network.hosts()}
-            
-            for future in as_completed(futures):
-                result = future.result()
-                if result:
-                    self.alive_hosts.append(result)
-                    print(f"✅ Host alive: {result}")
+        asyncio.run(self.discover(network))
         
         if not self.alive_hosts:
             print("🚫 No alive hosts found")
-            return
-        
-        print(f"\n🔍 Found {len(self.alive_hosts)} alive hosts. Gathering details...")
-        print("-" * 60)
-        
-        # Get detailed info for alive hosts
-        for ip in self.alive_hosts:
-            print(f"📋 Analyzing {ip}...")
-            
-            # Get hostname
-            hostname = self.get_hostname(ip)
-            
-            # Check common ports
-            ports = self.check_common_ports(ip)
-            
-            self.host_info[ip] = {
-                'hostname': hostname,
-                'open_ports': ports
-            }
-            
-            print(f"   Hostname: {hostname}")
-            if ports:
-                print(f"   Open ports: {', '.join(map(str, ports))}")
-            else:
-                print(f"   Open ports: None found")
-            print()
     
     def print_summary(self):
         """Print discovery summary"""
@@ -173,6 +327,9 @@ Examples:
   python network_discovery.py 192.168.1.0/24
   python network_discovery.py 10.0.0.0/8 --threads 100
   python network_discovery.py 172.16.0.0/12 --timeout 5
+  python network_discovery.py 10.20.0.0/16 --concurrency 1000
+  python network_discovery.py 192.168.1.0/24 --method ping
+  python network_discovery.py 10.0.0.0/8 --concurrency 2000 --scatter
 
 ⚠️  WARNING: Only use on networks you own or have explicit permission to scan!
         """
@@ -181,6 +338,13 @@ Examples:
     parser.add_argument("network", help="Network to scan (CIDR notation, e.g., 192.168.1.0/24)")
     parser.add_argument("--threads", "-t", type=int, default=50, help="Number of threads (default: 50)")
     parser.add_argument("--timeout", type=int, default=3, help="Timeout in seconds (default: 3)")
+    parser.add_argument("--method", "-m", choices=["tcp", "ping"], default="tcp",
+                       help="Liveness check: in-process TCP connects + ARP table, or the ping command (default: tcp)")
+    parser.add_argument("--concurrency", "-c", type=int, default=256,
+                       help="Hosts probed at once by the TCP sweep (default: 256)")
+    parser.add_argument("--scatter", action="store_true",
+                       help="Visit hosts in a scattered order, spreading load across subnets")
+    parser.add_argument("--seed", type=int, help="Seed for --scatter, to repeat an order")
     
     args = parser.parse_args()
     
@@ -203,7 +367,11 @@ Examples:
     discovery = NetworkDiscovery(
         network=args.network,
         threads=args.threads,
-        timeout=args.timeout
+        timeout=args.timeout,
+        method=args.method,
+        concurrency=args.concurrency,
+        scatter=args.scatter,
+        seed=args.seed
     )
     
     try:
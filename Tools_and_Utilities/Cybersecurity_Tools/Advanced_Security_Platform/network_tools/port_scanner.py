@@ -7,40 +7,591 @@ USE ONLY ON YOUR OWN SYSTEMS OR WITH EXPLICIT PERMISSION
 import socket
 import threading
 import argparse
+import asyncio
+import base64
+import collections
+import csv
+import errno
+import functools
+import hashlib
+import ipaddress
+import json
+import os
 import sys
 from datetime import datetime
 import time
+import zlib
+
+try:
+    import resource  # Unix only - used to raise the open file limit
+except ImportError:
+    resource = None
+
+# Labels reported for well-known ports instead of reading a banner
+SERVICE_LABELS = {
+    21: "FTP", 22: "SSH", 23: "Telnet", 25: "SMTP", 53: "DNS", 80: "HTTP",
+    110: "POP3", 135: "RPC", 139: "NetBIOS", 143: "IMAP", 443: "HTTPS",
+    445: "SMB", 993: "IMAPS", 995: "POP3S", 3389: "RDP"
+}
+
+# Seconds to wait for an unknown service to send a banner
+BANNER_TIMEOUT = 2
+
+# Ports where the client speaks first: send the HTTP probe without waiting for a greeting
+HTTP_PORTS = {80, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8888}
+
+# Ports that speak TLS or a binary protocol: there is no text greeting to read and an
+# HTTP probe only earns a binary reply, so these are labelled from SERVICE_LABELS
+OPAQUE_PORTS = {53, 135, 139, 443, 445, 993, 995, 3389}
+
+# Fingerprint cache entries are trusted without touching the service for this
+# many seconds, then probed again
+FINGERPRINT_MAX_AGE = 24 * 3600
+
+# Scan state files: a host's last full sweep is redone by --incremental after
+# this many seconds, and progress is saved at least this often while scanning
+STATE_MAX_AGE = 7 * 24 * 3600
+STATE_SAVE_INTERVAL = 15
+
+# Streamed results: open ports are flushed at once, other records at least this often
+RESULT_FLUSH_INTERVAL = 0.5
+
+# Congestion control: seconds per AIMD decision, rate kept after a backoff,
+# starting rate, additive step and rate floor as fractions of --pps, fewest
+# outcomes needed to judge the timeout ratio, and the rise over its usual
+# level that counts as congestion
+AIMD_INTERVAL = 0.25
+AIMD_DECREASE = 0.5
+AIMD_START_FRACTION = 0.1
+AIMD_STEP_FRACTION = 0.01
+AIMD_MIN_FRACTION = 0.01
+AIMD_MIN_SAMPLES = 20
+AIMD_TIMEOUT_JUMP = 0.2
+
+# Local socket errors that mean our own stack is saturated, not the target
+LOCAL_CONGESTION_ERRORS = {errno.ENOBUFS, errno.EADDRNOTAVAIL, errno.EMFILE, errno.ENFILE, errno.EAGAIN}
+
+# Columns of a streamed result record (CSV header order)
+RESULT_FIELDS = ["time", "host", "name", "port", "proto", "state", "service", "rtt_ms"]
+
+# File descriptors kept free for everything that is not a probe socket
+RESERVED_FDS = 64
+
+# Default per-host cap when several hosts are scanned at once
+DEFAULT_PER_HOST = 256
+
+# Adaptive timeouts (RFC 6298 style): smoothing gains for the RTT estimate
+# and its variance, and the shortest timeout ever used for a probe
+RTT_ALPHA = 1 / 8
+RTT_BETA = 1 / 4
+MIN_PROBE_TIMEOUT = 0.1
+
+
+def parse_ports(spec):
+    """Parse a port spec such as '22,80,443,8000-8100' into a sorted list of ports"""
+    ports = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                low, high = (int(value) for value in part.split('-', 1))
+            else:
+                low = high = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid port spec: {part}")
+        if not 1 <= low <= high <= 65535:
+            raise ValueError(f"Ports must be between 1 and 65535: {part}")
+        ports.update(range(low, high + 1))
+    if not ports:
+        raise ValueError("No ports given")
+    return sorted(ports)
+
+
+def expand_targets(specs):
+    """
+    Expand hostnames, IPs and CIDR ranges (each spec may be comma-separated)
+    into a list of (name, ip) pairs, without duplicates.
+    """
+    hosts = {}
+    for spec in specs:
+        for item in spec.split(','):
+            item = item.strip()
+            if not item:
+                continue
+            if '/' in item:
+                network = ipaddress.ip_network(item, strict=False)
+                addresses = list(network.hosts()) or [network.network_address]
+                for address in addresses:
+                    hosts.setdefault(str(address), str(address))
+                continue
+            try:
+                ip = socket.gethostbyname(item)
+            except socket.gaierror:
+                raise ValueError(f"Cannot resolve hostname: {item}")
+            hosts.setdefault(ip, item)
+    return [(name, ip) for ip, name in hosts.items()]
+
+
+def identify_service(port, data):
+    """
+    Name the service from its greeting or probe response (bytes). Replies that
+    are not printable text (TLS alerts, RDP, Telnet negotiation) or do not
+    parse as a known protocol fall back to the port's SERVICE_LABELS entry.
+    """
+    try:
+        text = data.decode('utf-8').strip()
+    except UnicodeDecodeError:
+        text = ""
+    lines = text.splitlines()
+    first = lines[0].strip() if lines else ""
+    if not first.isprintable():
+        first = ""
+    
+    if first.startswith('SSH-'):
+        # SSH-2.0-OpenSSH_8.9p1 Ubuntu-3 -> software version after the protocol
+        parts = first.split('-', 2)
+        service = f"SSH {parts[2]}" if len(parts) == 3 else "SSH"
+    elif first.startswith('HTTP/'):
+        server = next((line.split(':', 1)[1].strip() for line in lines
+                       if line.lower().startswith('server:')), None)
+        service = f"HTTP ({server})" if server else f"HTTP ({first})"
+    elif first.startswith('220'):
+        is_smtp = 'SMTP' in first.upper() or port in (25, 465, 587)
+        service = f"{'SMTP' if is_smtp else 'FTP'}: {first[4:]}"
+    elif first.startswith('+OK'):
+        service = f"POP3: {first[3:].strip()}"
+    elif first.startswith('* OK'):
+        service = f"IMAP: {first[4:].strip()}"
+    else:
+        service = SERVICE_LABELS.get(port) or first or "Unknown"
+    return service[:50]
+
+
+class ResultWriter:
+    """
+    Stream scan results as JSONL or CSV records while the scan runs, so they
+    can be piped into other tools or watched live. Records are buffered
+    and flushed every RESULT_FLUSH_INTERVAL seconds; open ports are flushed
+    immediately.
+    """
+    
+    def __init__(self, stream, output_format="jsonl"):
+        self.stream = stream
+        self.output_format = output_format
+        self.last_flush = time.monotonic()
+        self.records = 0
+        if output_format == "csv":
+            self.csv = csv.writer(stream, lineterminator='\n')
+            self.csv.writerow(RESULT_FIELDS)
+    
+    def write(self, record):
+        if self.output_format == "csv":
+            self.csv.writerow([record.get(field, "") for field in RESULT_FIELDS])
+        else:
+            self.stream.write(json.dumps(record) + '\n')
+        self.records += 1
+        
+        now = time.monotonic()
+        if record.get('state') == 'open' or now - self.last_flush >= RESULT_FLUSH_INTERVAL:
+            self.stream.flush()
+            self.last_flush = now
+    
+    def close(self, summary=None):
+        """Write the closing summary record (JSONL only) and flush"""
+        if summary and self.output_format == "jsonl":
+            self.stream.write(json.dumps(summary) + '\n')
+        self.stream.flush()
+        if self.stream not in (sys.stdout, sys.__stdout__):
+            self.stream.close()
+
+
+class TokenBucket:
+    """Let probes start at `rate` per second on average, in bursts of at most ~100 ms worth"""
+    
+    def __init__(self, rate):
+        self.set_rate(rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+    
+    def set_rate(self, rate):
+        self.rate = rate
+        self.burst = max(1.0, rate / 10)
+    
+    async def acquire(self):
+        """Wait for a token"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CongestionController:
+    """
+    AIMD control of a TokenBucket's rate, like TCP congestion control.
+    The rate starts low and every AIMD_INTERVAL seconds the probe outcomes
+    are judged: lost probes (timed out, then answered on retry), local
+    socket errors, or a jump in the share of timeouts over its usual level
+    halve the rate; otherwise it grows by a small fixed step towards the
+    configured maximum. Small steps keep overshoots (and the probes they
+    lose) short.
+    Refusals are normal answers from closed ports and count as answers.
+    """
+    
+    def __init__(self, bucket, max_rate):
+        self.bucket = bucket
+        self.max_rate = max_rate
+        self.min_rate = max(1.0, max_rate * AIMD_MIN_FRACTION)
+        self.step = max_rate * AIMD_STEP_FRACTION
+        bucket.set_rate(max(self.min_rate, max_rate * AIMD_START_FRACTION))
+        self.counts = collections.Counter()  # outcome -> count this interval
+        self.interval_start = time.monotonic()
+        self.timeout_baseline = None  # usual timeout share (filtered ports)
+        self.backoffs = 0
+    
+    def record(self, outcome):
+        """Count an outcome: 'answer', 'timeout', 'loss' or 'local_error'"""
+        self.counts[outcome] += 1
+        if time.monotonic() - self.interval_start >= AIMD_INTERVAL:
+            self.adjust()
+    
+    def adjust(self):
+        total = sum(self.counts.values())
+        timeout_share = self.counts['timeout'] / total
+        baseline = self.timeout_baseline
+        
+        congested = (self.counts['loss'] or self.counts['local_error'] or
+                     (baseline is not None and total >= AIMD_MIN_SAMPLES and
+                      timeout_share > baseline + AIMD_TIMEOUT_JUMP))
+        if congested:
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate * AIMD_DECREASE))
+            self.backoffs += 1
+        else:
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.step))
+        
+        # Follow the usual timeout share slowly, so a filtered host is not "congestion"
+        self.timeout_baseline = (timeout_share if baseline is None
+                                 else 0.9 * baseline + 0.1 * timeout_share)
+        self.counts.clear()
+        self.interval_start = time.monotonic()
+
+
+class HostState:
+    """
+    Scheduling state of one host: the ports left to probe, probes in flight
+    and a smoothed connect round-trip time used to size its timeouts.
+    """
+    
+    def __init__(self, name, ip, ports):
+        self.name = name
+        self.ip = ip
+        self.ports = iter(ports)
+        self.active = 0
+        self.srtt = None    # smoothed RTT (seconds)
+        self.rttvar = None  # RTT variation
+        self.samples = 0
+    
+    def add_rtt_sample(self, rtt):
+        """Fold one measured connect time (SYN-ACK or RST) into the estimate"""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - RTT_BETA) * self.rttvar + RTT_BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - RTT_ALPHA) * self.srtt + RTT_ALPHA * rtt
+        self.samples += 1
+    
+    def timeout(self, max_timeout):
+        """srtt + 4 * rttvar, clamped; the full timeout until the first reply"""
+        if self.srtt is None:
+            return max_timeout
+        return min(max_timeout, max(MIN_PROBE_TIMEOUT, self.srtt + 4 * self.rttvar))
+
+
+def pack_bitmap(bitmap):
+    """Port bitmap (an int, bit n = port n) -> compact text for the state file"""
+    raw = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    return base64.b64encode(zlib.compress(raw)).decode('ascii')
+
+
+def unpack_bitmap(text):
+    return int.from_bytes(zlib.decompress(base64.b64decode(text)), 'little') if text else 0
+
+
+def ports_to_bitmap(ports):
+    raw = bytearray(8192)
+    for port in ports:
+        raw[port >> 3] |= 1 << (port & 7)
+    return int.from_bytes(raw, 'little')
+
+
+def bitmap_to_ports(bitmap):
+    """Set of the ports whose bit is set"""
+    raw = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    return {index * 8 + bit for index, byte in enumerate(raw) if byte
+            for bit in range(8) if byte >> bit & 1}
+
+
+class ScanState:
+    """
+    Scan progress and results kept between runs in a JSON state file.
+    Per host it holds a bitmap of the ports completed in the current pass,
+    so an interrupted scan resumes where it stopped; a bitmap of the ports
+    covered by earlier passes and when the last full sweep ran; and the
+    open ports with their service. Incremental passes use these to re-probe
+    only what may have changed.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.hosts = {}         # ip -> {'done', 'swept', 'swept_at', 'open'}
+        self.current = None     # unfinished pass: {'key', 'started', 'incremental'}
+        self.resumed = False
+        self.skipped = 0        # requested ports not probed in this run
+        self.changes = []       # (ip, port, state, service, previous service)
+        self.load()
+    
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            for ip, entry in data.get('hosts', {}).items():
+                self.hosts[ip] = {
+                    'done': unpack_bitmap(entry.get('done')),
+                    'swept': unpack_bitmap(entry.get('swept')),
+                    'swept_at': entry.get('swept_at'),
+                    'open': {int(port): info for port, info in entry.get('open', {}).items()}
+                }
+            self.current = data.get('pass')
+        except (ValueError, KeyError, zlib.error, IOError) as e:
+            print(f"⚠️  Ignoring unreadable scan state {self.path}: {e}")
+            self.hosts = {}
+            self.current = None
+    
+    def save(self):
+        """Atomically write the state file"""
+        data = {'version': 1, 'pass': self.current, 'hosts': {}}
+        for ip, entry in self.hosts.items():
+            data['hosts'][ip] = {
+                'done': pack_bitmap(entry['done']),
+                'swept': pack_bitmap(entry['swept']),
+                'swept_at': entry['swept_at'],
+                'open': {str(port): info for port, info in sorted(entry['open'].items())}
+            }
+        temp_file = self.path + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_file, self.path)
+    
+    def host(self, ip):
+        return self.hosts.setdefault(ip, {'done': 0, 'swept': 0, 'swept_at': None, 'open': {}})
+    
+    def begin(self, hosts, ports, incremental=False, stale_after=STATE_MAX_AGE):
+        """
+        Start a pass over hosts x ports, or resume the unfinished one if it
+        was for the same hosts, ports and mode. Returns {ip: ports to probe}:
+        ports already done in this pass are left out and, when incremental,
+        so are ports that were not open in a sweep younger than stale_after.
+        """
+        key = hashlib.sha1(json.dumps([sorted(ip for _, ip in hosts), ports,
+                                       incremental]).encode()).hexdigest()[:16]
+        if self.current and self.current['key'] == key:
+            self.resumed = True
+        else:
+            if self.current:
+                print(f"⚠️  {self.path} holds an unfinished scan of other targets - starting over")
+            for entry in self.hosts.values():
+                entry['done'] = 0
+            self.current = {'key': key, 'started': time.time(), 'incremental': incremental}
+        
+        stale_before = time.time() - stale_after
+        plan = {}
+        for _, ip in hosts:
+            entry = self.host(ip)
+            skip = bitmap_to_ports(entry['done'])
+            if incremental and entry['swept_at'] is not None and entry['swept_at'] >= stale_before:
+                # Swept recently and not open then - nothing to re-check
+                skip |= bitmap_to_ports(entry['swept']) - set(entry['open'])
+            plan[ip] = [port for port in ports if port not in skip]
+            self.skipped += len(ports) - len(plan[ip])
+        return plan
+    
+    def completed_open(self):
+        """Open ports already found by the interrupted part of this pass"""
+        for ip, entry in self.hosts.items():
+            for port, info in sorted(entry['open'].items()):
+                if entry['done'] >> port & 1:
+                    yield ip, port, info['service']
+    
+    def record(self, ip, port, state, service=None):
+        """Mark a port done in this pass and note a change against earlier passes"""
+        entry = self.host(ip)
+        entry['done'] |= 1 << port
+        previous = entry['open'].get(port)
+        known = previous is not None or entry['swept'] >> port & 1
+        if state == 'open':
+            entry['open'][port] = {'service': service, 'seen': time.time()}
+            if known and (previous is None or previous['service'] != service):
+                self.changes.append((ip, port, state, service,
+                                     previous['service'] if previous else None))
+        elif previous is not None:
+            del entry['open'][port]
+            self.changes.append((ip, port, state, None, previous['service']))
+    
+    def finish(self, hosts, ports):
+        """
+        Close the pass: its ports join the swept bitmap, and a host whose
+        requested ports were all probed counts as freshly swept.
+        """
+        wanted = ports_to_bitmap(ports)
+        for _, ip in hosts:
+            entry = self.host(ip)
+            entry['swept'] |= entry['done']
+            if entry['done'] & wanted == wanted:
+                entry['swept_at'] = self.current['started']
+            entry['done'] = 0
+        self.current = None
+
+
+def raise_fd_limit(wanted):
+    """
+    Raise the soft open-file limit towards wanted + RESERVED_FDS (up to the
+    hard limit). Returns how many sockets can safely be open at once.
+    """
+    if resource is None:
+        return wanted
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = wanted + RESERVED_FDS
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        new_soft = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+            soft = new_soft
+        except (ValueError, OSError):
+            pass
+    if soft == resource.RLIM_INFINITY:
+        return wanted
+    return max(1, min(wanted, soft - RESERVED_FDS))
+
 
 class PortScanner:
-    def __init__(self, target, start_port=1, end_port=1000, threads=100, timeout=3):
-        self.target = target
-        self.start_port = start_port
-        self.end_port = end_port
+    def __init__(self, target, start_port=1, end_port=1000, threads=100, timeout=3,
+                 engine="asyncio", concurrency=1000, ports=None, per_host=None,
+                 adaptive=True, retries=1, banner_concurrency=100, fingerprint_cache=None,
+                 result_writer=None, all_ports=False, pps=None, congestion_control=True,
+                 scan_state=None, incremental=False, stale_after=STATE_MAX_AGE):
+        """
+        target is a hostname, IP or CIDR, or a list of them. ports is a list
+        of ports (see parse_ports); without it start_port-end_port is scanned.
+        scan_state is a ScanState to resume from and record into.
+        """
+        self.target = target if isinstance(target, str) else ','.join(target)
+        self.ports = list(ports) if ports else list(range(start_port, end_port + 1))
+        self.start_port = self.ports[0]
+        self.end_port = self.ports[-1]
         self.threads = threads
         self.timeout = timeout
-        self.open_ports = []
+        self.engine = engine            # "asyncio" (single thread) or "threads"
+        self.concurrency = concurrency  # probes in flight for the asyncio engine
+        self.adaptive = adaptive        # per-host timeouts from measured RTT (asyncio engine)
+        self.retries = retries          # extra attempts after an ambiguous timeout
+        self.timeouts = 0
+        self.retried = 0
+        self.host_states = []
+        self.banner_concurrency = banner_concurrency  # fingerprint stage workers
+        self.fingerprint_cache = fingerprint_cache    # JSON file shared between runs
+        self.fingerprints = self.load_fingerprints()  # "ip:port" -> entry
+        self.fingerprinted = 0
+        self.cache_hits = 0
+        self.banner_queue = None
+        # Probes per second (asyncio engine): a token bucket, steered by AIMD unless disabled
+        self.rate_limiter = TokenBucket(pps) if pps else None
+        self.congestion = (CongestionController(self.rate_limiter, pps)
+                           if pps and congestion_control else None)
+        self.result_writer = result_writer  # ResultWriter for streamed records, or None
+        self.all_ports = all_ports          # also stream closed / filtered ports
+        # Streamed results are not kept in memory - the summary then shows counts only
+        self.keep_results = result_writer is None
+        self.open_ports = []            # (ip, port, banner), only while keep_results
+        self.open_count = 0
+        self.scan_state = scan_state
+        self.incremental = incremental  # re-probe only known open, stale or new ports
+        self.stale_after = stale_after
         self.lock = threading.Lock()
         
-        # Resolve hostname to IP
+        # Resolve hostnames and expand CIDR ranges to IPs
         try:
-            self.target_ip = socket.gethostbyname(target)
-        except socket.gaierror:
-            print(f"❌ Cannot resolve hostname: {target}")
+            self.hosts = expand_targets([target] if isinstance(target, str) else target)
+        except ValueError as e:
+            print(f"❌ {e}")
             sys.exit(1)
+        if not self.hosts:
+            print("❌ No targets to scan")
+            sys.exit(1)
+        self.target_ip = self.hosts[0][1]
+        self.host_names = {ip: name for name, ip in self.hosts}
+        self.multi_host = len(self.hosts) > 1
+        # Probes in flight against any one host (asyncio engine)
+        self.per_host = per_host or (min(concurrency, DEFAULT_PER_HOST) if self.multi_host
+                                     else concurrency)
+        self.plan = {ip: self.ports for _, ip in self.hosts}  # ports to probe per host
+    
+    def write_record(self, ip, port, state, service="", rtt=None):
+        """Stream one result record (caller holds self.lock)"""
+        self.result_writer.write({
+            'type': 'port',
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'host': ip,
+            'name': self.host_names.get(ip, ip),
+            'port': port,
+            'proto': 'tcp',
+            'state': state,
+            'service': service,
+            'rtt_ms': round(rtt * 1000, 3) if rtt is not None else None
+        })
     
-    def scan_port(self, port):
+    def report_open(self, ip, port, banner, rtt=None):
+        """Record an open port and print it straight away"""
+        with self.lock:
+            if self.scan_state:
+                self.scan_state.record(ip, port, 'open', banner)
+            self.open_count += 1
+            if self.keep_results:
+                self.open_ports.append((ip, port, banner))
+            if self.result_writer:
+                self.write_record(ip, port, 'open', banner, rtt)
+            host = f"{ip:15s} " if self.multi_host else ""
+            print(f"✅ {host}Port {port:5d}/tcp open    {banner}")
+    
+    def report_state(self, ip, port, state, rtt=None):
+        """Record a closed / filtered / unreachable port (streamed when --all-ports is set)"""
+        with self.lock:
+            if self.scan_state:
+                self.scan_state.record(ip, port, state)
+            if self.result_writer and self.all_ports:
+                self.write_record(ip, port, state, rtt=rtt)
+    
+    def scan_port(self, port, ip=None):
         """Scan a single port"""
+        ip = ip or self.target_ip
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(self.timeout)
-            result = sock.connect_ex((self.target_ip, port))
+            result = sock.connect_ex((ip, port))
             
             if result == 0:
                 # Try to grab banner
                 banner = self.grab_banner(sock, port)
-                with self.lock:
-                    self.open_ports.append((port, banner))
-                    print(f"✅ Port {port:5d}/tcp open    {banner}")
+                self.report_open(ip, port, banner)
+            else:
+                self.report_state(ip, port, 'closed' if result == errno.ECONNREFUSED else 'filtered')
             
             sock.close()
             
@@ -50,84 +601,407 @@ class PortScanner:
     def grab_banner(self, sock, port):
         """Try to grab service banner"""
         try:
-            if port == 22:
-                return "SSH"
-            elif port == 21:
-                return "FTP"
-            elif port == 80:
-                return "HTTP"
-            elif port == 443:
-                return "HTTPS"
-            elif port == 25:
-                return "SMTP"
-            elif port == 110:
-                return "POP3"
-            elif port == 143:
-                return "IMAP"
-            elif port == 993:
-                return "IMAPS"
-            elif port == 995:
-                return "POP3S"
-            elif port == 3389:
-                return "RDP"
-            elif port == 23:
-                return "Telnet"
-            elif port == 53:
-                return "DNS"
-            elif port == 135:
-                return "RPC"
-            elif port == 139:
-                return "NetBIOS"
-            elif port == 445:
-                return "SMB"
-            else:
-                # Try to get actual banner
-                sock.send(b'\r\n')
-                banner = sock.recv(1024).decode('utf-8', errors='ignore').strip()
-                return banner[:50] if banner else "Unknown"
+            if port in SERVICE_LABELS:
+                return SERVICE_LABELS[port]
+            # Try to get actual banner
+            sock.send(b'\r\n')
+            banner = sock.recv(1024).decode('utf-8', errors='ignore').strip()
+            return banner[:50] if banner else "Unknown"
                 
         except:
             return "Unknown"
     
+    def load_fingerprints(self):
+        """
+        Read the fingerprint cache, dropping entries older than FINGERPRINT_MAX_AGE
+        and the greeting-hash entries (ip:port:hash) written by older versions
+        """
+        if not self.fingerprint_cache or not os.path.exists(self.fingerprint_cache):
+            return {}
+        try:
+            with open(self.fingerprint_cache, 'r') as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"⚠️  Ignoring unreadable fingerprint cache {self.fingerprint_cache}: {e}")
+            return {}
+        oldest = time.time() - FINGERPRINT_MAX_AGE
+        return {key: entry for key, entry in entries.items()
+                if entry.get('seen', 0) >= oldest and key.count(':') == 1}
+    
+    def save_fingerprints(self):
+        """Atomically write the fingerprint cache"""
+        if not self.fingerprint_cache:
+            return
+        temp_file = self.fingerprint_cache + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump(self.fingerprints, f, indent=1)
+        os.replace(temp_file, self.fingerprint_cache)
+    
+    async def read_banner(self, reader):
+        """Whatever the service sends within BANNER_TIMEOUT (b'' if nothing)"""
+        try:
+            return await asyncio.wait_for(reader.read(1024), BANNER_TIMEOUT)
+        except (asyncio.TimeoutError, OSError):
+            return b''
+    
+    async def fingerprint(self, ip, port, reader, writer):
+        """
+        Identify the service on an open connection. Server-first protocols
+        (SSH, SMTP, FTP, POP3, IMAP) greet on their own; if nothing arrives
+        an HTTP HEAD request is sent. TLS and binary-protocol ports
+        (OPAQUE_PORTS) get neither and are named from SERVICE_LABELS.
+        Results are cached by host and port for FINGERPRINT_MAX_AGE, so a
+        rescan skips both the greeting wait and the probe.
+        """
+        if port in OPAQUE_PORTS:
+            return SERVICE_LABELS.get(port, "Unknown")
+        
+        key = f"{ip}:{port}"
+        cached = self.fingerprints.get(key)
+        if cached:
+            self.cache_hits += 1
+            return cached['service']
+        
+        data = b''
+        if port not in HTTP_PORTS:
+            data = await self.read_banner(reader)
+        if not data:
+            try:
+                writer.write(f"HEAD / HTTP/1.0\r\nHost: {ip}\r\n\r\n".encode())
+                await writer.drain()
+                data = await self.read_banner(reader)
+            except OSError:
+                pass
+        
+        service = identify_service(port, data)
+        self.fingerprinted += 1
+        self.fingerprints[key] = {'service': service, 'seen': time.time()}
+        return service
+    
+    async def fingerprint_worker(self):
+        """Fingerprint stage: identify open ports handed over by the connect stage"""
+        while True:
+            ip, port, rtt, reader, writer = await self.banner_queue.get()
+            try:
+                service = await self.fingerprint(ip, port, reader, writer)
+            except Exception:
+                service = SERVICE_LABELS.get(port, "Unknown")
+            finally:
+                writer.close()
+            self.report_open(ip, port, service, rtt)
+            self.banner_queue.task_done()
+    
+    def probe_timeout(self, host, attempt):
+        """Timeout for a probe: adaptive per host, doubled on every retry, at most self.timeout"""
+        base = host.timeout(self.timeout) if self.adaptive else self.timeout
+        return min(self.timeout, base * 2 ** attempt)
+    
+    async def open_connection(self, host, port, attempt):
+        """
+        asyncio.open_connection with a deadline that follows the host's RTT
+        estimate while waiting: probes started before the first reply are
+        cut short as soon as an estimate exists. Raises asyncio.TimeoutError.
+        """
+        start = time.perf_counter()
+        connect = asyncio.ensure_future(asyncio.open_connection(host.ip, port))
+        try:
+            while not connect.done():
+                remaining = start + self.probe_timeout(host, attempt) - time.perf_counter()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                if host.srtt is None and self.adaptive:
+                    remaining = min(remaining, MIN_PROBE_TIMEOUT)  # look for a new estimate soon
+                await asyncio.wait({connect}, timeout=remaining)
+        except BaseException:
+            connect.cancel()
+            try:
+                await connect
+            except (asyncio.CancelledError, OSError):
+                pass
+            else:
+                connect.result()[1].close()  # connected just as we gave up
+            raise
+        return connect.result()
+    
+    def record_outcome(self, outcome):
+        if self.congestion:
+            self.congestion.record(outcome)
+    
+    async def probe_port(self, host, port):
+        """
+        Connect to one port; record it (with its banner) if it accepts.
+        Accepts and refusals are definite answers and give RTT samples.
+        Only a timeout shorter than self.timeout is ambiguous (the SYN may
+        have been lost, or the estimate was too tight) and is retried.
+        """
+        for attempt in range(self.retries + 1):
+            if attempt and self.rate_limiter:
+                await self.rate_limiter.acquire()  # first attempts are paced by scan_async
+            start = time.perf_counter()
+            try:
+                reader, writer = await self.open_connection(host, port, attempt)
+                break
+            except asyncio.TimeoutError:
+                timeout = self.probe_timeout(host, attempt)
+                self.timeouts += 1
+                self.record_outcome('timeout')
+                if timeout >= self.timeout or attempt == self.retries:
+                    self.report_state(host.ip, port, 'filtered')
+                    return
+                self.retried += 1
+            except ConnectionRefusedError:
+                rtt = time.perf_counter() - start
+                host.add_rtt_sample(rtt)
+                self.record_outcome('loss' if attempt else 'answer')
+                self.report_state(host.ip, port, 'closed', rtt)
+                return
+            except OSError as e:
+                if e.errno in LOCAL_CONGESTION_ERRORS and attempt < self.retries:
+                    # Our own stack ran out of resources - the probe never left
+                    self.record_outcome('local_error')
+                    self.retried += 1
+                    continue
+                self.report_state(host.ip, port, 'unreachable')
+                return
+        rtt = time.perf_counter() - start
+        host.add_rtt_sample(rtt)
+        self.record_outcome('loss' if attempt else 'answer')
+        
+        # Hand the connection to the fingerprint stage and free this connect slot
+        await self.banner_queue.put((host.ip, port, rtt, reader, writer))
+    
+    async def scan_async(self):
+        """
+        Scan every host x port from a single thread. Hosts take turns
+        round-robin, one probe each, so probes are interleaved across hosts.
+        A host already at its per-host cap is skipped until one of its
+        probes finishes. The global semaphore is taken before each task is
+        created, so at most `concurrency` probe tasks (and sockets) exist at
+        any time, however many probes are scheduled.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        freed = asyncio.Event()
+        tasks = set()
+        
+        # Bounded hand-off: a full queue holds back the connect stage
+        self.banner_queue = asyncio.Queue(maxsize=self.banner_concurrency)
+        fingerprinters = [asyncio.create_task(self.fingerprint_worker())
+                          for _ in range(self.banner_concurrency)]
+        self.host_states = [HostState(name, ip, self.plan[ip]) for name, ip in self.hosts]
+        hosts = collections.deque(self.host_states)
+        saver = asyncio.create_task(self.save_state_periodically()) if self.scan_state else None
+        
+        def finished(host, task):
+            tasks.discard(task)
+            host.active -= 1
+            semaphore.release()
+            freed.set()
+            if not task.cancelled() and task.exception():
+                print(f"⚠️  Probe error on {host.ip}: {task.exception()!r}")
+        
+        skipped = 0
+        while hosts:
+            host = hosts.popleft()
+            if host.active >= self.per_host:
+                hosts.append(host)
+                skipped += 1
+                if skipped >= len(hosts):
+                    # Every remaining host is at its cap - wait for a probe to finish
+                    freed.clear()
+                    await freed.wait()
+                    skipped = 0
+                continue
+            
+            port = next(host.ports, None)
+            if port is None:
+                continue  # all of this host's probes are scheduled
+            skipped = 0
+            
+            await semaphore.acquire()
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            host.active += 1
+            task = asyncio.create_task(self.probe_port(host, port))
+            tasks.add(task)
+            task.add_done_callback(functools.partial(finished, host))
+            hosts.append(host)
+        
+        if tasks:
+            await asyncio.gather(*tasks)
+        
+        await self.banner_queue.join()
+        for worker in fingerprinters:
+            worker.cancel()
+        if saver:
+            saver.cancel()
+    
+    async def save_state_periodically(self):
+        """Write the scan state every STATE_SAVE_INTERVAL seconds, in case the process dies"""
+        while True:
+            await asyncio.sleep(STATE_SAVE_INTERVAL)
+            with self.lock:
+                self.scan_state.save()
+    
+    def begin_state(self):
+        """Work out which ports still need probing and restore results of an interrupted pass"""
+        self.plan = self.scan_state.begin(self.hosts, self.ports, self.incremental, self.stale_after)
+        requested = len(self.ports) * len(self.hosts)
+        planned = requested - self.scan_state.skipped
+        if self.scan_state.resumed:
+            print(f"💾 Resuming interrupted scan from {self.scan_state.path}: "
+                  f"{planned:,} of {requested:,} ports left")
+            restored = 0
+            for ip, port, service in self.scan_state.completed_open():
+                if ip not in self.host_names:
+                    continue
+                restored += 1
+                self.open_count += 1
+                if self.keep_results:
+                    self.open_ports.append((ip, port, service))
+                if self.result_writer:
+                    self.write_record(ip, port, 'open', service)
+            if restored:
+                print(f"♻️  {restored} open ports restored from the interrupted part")
+        elif self.incremental:
+            print(f"💾 Incremental scan: {planned:,} of {requested:,} ports are known open, "
+                  f"stale or new")
+        else:
+            print(f"💾 Recording progress in {self.scan_state.path}")
+    
     def scan(self):
         """Main scanning function"""
-        print(f"🎯 Target: {self.target} ({self.target_ip})")
-        print(f"📊 Scanning ports {self.start_port}-{self.end_port}")
-        print(f"⚡ Threads: {self.threads}, Timeout: {self.timeout}s")
+        if self.multi_host:
+            print(f"🎯 Targets: {self.target} ({len(self.hosts)} hosts)")
+        else:
+            print(f"🎯 Target: {self.target} ({self.target_ip})")
+        if self.ports == list(range(self.start_port, self.end_port + 1)):
+            print(f"📊 Scanning ports {self.start_port}-{self.end_port}")
+        else:
+            print(f"📊 Scanning {len(self.ports)} ports ({self.start_port}-{self.end_port})")
+        if self.engine == "asyncio":
+            # Sockets: probes in flight plus connections queued for and held by the fingerprint stage
+            sockets = raise_fd_limit(self.concurrency + 2 * self.banner_concurrency)
+            self.concurrency = max(1, min(self.concurrency, sockets - 2 * self.banner_concurrency))
+            self.per_host = min(self.per_host, self.concurrency)
+            per_host = f" ({self.per_host} per host)" if self.multi_host else ""
+            timeout = (f"adaptive (max {self.timeout}s, {self.retries} retries)"
+                       if self.adaptive else f"{self.timeout}s")
+            print(f"⚡ Engine: asyncio, {self.concurrency} probes in flight{per_host}, "
+                  f"Timeout: {timeout}")
+            if self.rate_limiter:
+                if self.congestion:
+                    print(f"🚦 Rate limit: AIMD between {self.congestion.min_rate:,.0f} and "
+                          f"{self.congestion.max_rate:,.0f} probes/s, "
+                          f"starting at {self.rate_limiter.rate:,.0f}")
+                else:
+                    print(f"🚦 Rate limit: {self.rate_limiter.rate:,.0f} probes/s")
+        else:
+            print(f"⚡ Threads: {self.threads}, Timeout: {self.timeout}s")
+        if self.scan_state:
+            self.begin_state()
         print(f"🕒 Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("-" * 60)
         
+        start_time = time.time()
+        try:
+            if self.engine == "asyncio":
+                asyncio.run(self.scan_async())
+            else:
+                self.scan_threads()
+            if self.scan_state:
+                self.scan_state.finish(self.hosts, self.ports)
+        finally:
+            if self.scan_state:
+                self.scan_state.save()
+            self.save_fingerprints()
+            self.elapsed = time.time() - start_time
+            if self.result_writer:
+                self.result_writer.close({
+                    'type': 'summary',
+                    'time': datetime.now().isoformat(timespec='seconds'),
+                    'hosts': len(self.hosts),
+                    'ports': len(self.ports),
+                    'open': self.open_count,
+                    'elapsed_s': round(self.elapsed, 3)
+                })
+        
+        self.print_results()
+    
+    def scan_threads(self):
+        """Original engine: one thread per port, at most self.threads alive"""
         # Create and start threads
         thread_list = []
         
-        for port in range(self.start_port, self.end_port + 1):
-            # Limit concurrent threads
-            while len([t for t in thread_list if t.is_alive()]) >= self.threads:
-                time.sleep(0.01)
-            
-            thread = threading.Thread(target=self.scan_port, args=(port,))
-            thread.daemon = True
-            thread.start()
-            thread_list.append(thread)
+        planned = {ip: set(ports) for ip, ports in self.plan.items()} if self.scan_state else None
+        for port in self.ports:
+            for _, ip in self.hosts:
+                if planned is not None and port not in planned[ip]:
+                    continue
+                # Limit concurrent threads
+                while len([t for t in thread_list if t.is_alive()]) >= self.threads:
+                    time.sleep(0.01)
+                
+                thread = threading.Thread(target=self.scan_port, args=(port, ip))
+                thread.daemon = True
+                thread.start()
+                thread_list.append(thread)
         
         # Wait for all threads to complete
         for thread in thread_list:
             thread.join()
-        
-        self.print_results()
     
     def print_results(self):
         """Print scan results"""
         print("-" * 60)
-        print(f"📋 Scan completed: {len(self.open_ports)} open ports found")
+        print(f"📋 Scan completed: {self.open_count} open ports found")
+        probes = sum(len(ports) for ports in self.plan.values())
+        print(f"⏱️  {probes:,} ports in {self.elapsed:.2f}s ({probes / max(self.elapsed, 1e-9):,.0f} ports/s)")
+        if self.timeouts:
+            print(f"⌛ {self.timeouts:,} probe timeouts, {self.retried:,} retried")
+        if self.congestion:
+            print(f"🚦 Final rate {self.rate_limiter.rate:,.0f} probes/s after "
+                  f"{self.congestion.backoffs} congestion backoffs")
+        if self.fingerprinted or self.cache_hits:
+            print(f"🧬 Fingerprints: {self.fingerprinted} probed, {self.cache_hits} from cache")
+        if self.adaptive and self.engine == "asyncio":
+            measured = [host for host in self.host_states if host.srtt is not None]
+            for host in measured[:10]:
+                print(f"📶 {host.ip}: RTT {host.srtt * 1000:.2f} ms "
+                      f"(±{host.rttvar * 1000:.2f}), timeout {host.timeout(self.timeout) * 1000:.0f} ms")
+            if len(measured) > 10:
+                print(f"📶 ... and {len(measured) - 10} more hosts with RTT estimates")
+        
+        if self.result_writer:
+            print(f"📝 {self.result_writer.records:,} result records streamed")
+        if self.scan_state and self.scan_state.skipped:
+            print(f"💾 {self.scan_state.skipped:,} ports skipped (done earlier or unchanged since the last sweep)")
+        if self.scan_state and self.scan_state.changes:
+            print("\n🔄 Changes since the last scan:")
+            for ip, port, state, service, previous in self.scan_state.changes[:50]:
+                if state != 'open':
+                    print(f"  🔻 {ip}:{port} now {state} (was open: {previous})")
+                elif previous is None:
+                    print(f"  🆕 {ip}:{port} now open: {service}")
+                else:
+                    print(f"  ✏️  {ip}:{port} service changed: {previous} -> {service}")
+            if len(self.scan_state.changes) > 50:
+                print(f"  ... and {len(self.scan_state.changes) - 50} more")
         
         if self.open_ports:
             print("\n🔍 Open Ports Summary:")
-            print("Port     Service")
-            print("-" * 20)
-            for port, banner in sorted(self.open_ports):
-                print(f"{port:5d}    {banner}")
-        else:
+            by_host = collections.defaultdict(list)
+            for ip, port, banner in self.open_ports:
+                by_host[ip].append((port, banner))
+            for name, ip in self.hosts:
+                if ip not in by_host:
+                    continue
+                if self.multi_host:
+                    print(f"\n🖥️  {ip}" + (f" ({name})" if name != ip else ""))
+                print("Port     Service")
+                print("-" * 20)
+                for port, banner in sorted(by_host[ip]):
+                    print(f"{port:5d}    {banner}")
+        elif not self.open_count:
             print("🚫 No open ports found in the specified range")
         
         print(f"\n⏰ Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -140,17 +1014,71 @@ def main():
 Examples:
   python port_scanner.py localhost
   python port_scanner.py 127.0.0.1 --start 1 --end 1000
-  python port_scanner.py myserver.local --threads 50 --timeout 5
+  python port_scanner.py myserver.local --concurrency 500 --timeout 5 --retries 2
+  python port_scanner.py 127.0.0.1 --start 1 --end 65535 --concurrency 5000
+  python port_scanner.py 127.0.0.1 --engine threads --threads 50
+  
+  # Stream results as JSONL into another tool (progress goes to stderr)
+  python port_scanner.py 192.168.1.0/24 -p 22,80,443 -o - | jq -c 'select(.state == "open")'
+  python port_scanner.py 127.0.0.1 -p 1-65535 -o scan.csv --all-ports
+  
+  # Gentle on a shared network: at most 500 new probes/s, backing off on losses
+  python port_scanner.py 192.168.1.0/24 -p 1-1024 --pps 500
+  
+  # Nightly audit: a full sweep the first time (Ctrl-C and rerun to resume),
+  # then only known open ports plus a full re-sweep once a week
+  python port_scanner.py 192.168.1.0/24 -p 1-65535 --state lab.json --incremental
+  
+  # Several hosts / subnets and a port list, at most 50 probes per host
+  python port_scanner.py 192.168.1.0/24 192.168.2.10 --ports 22,80,443,8000-8100 --per-host 50
 
 ⚠️  WARNING: Only use on systems you own or have explicit permission to test!
         """
     )
     
-    parser.add_argument("target", help="Target hostname or IP address")
+    parser.add_argument("target", nargs="+",
+                       help="Target hostnames, IP addresses or CIDR ranges (comma-separated or several)")
     parser.add_argument("--start", "-s", type=int, default=1, help="Start port (default: 1)")
     parser.add_argument("--end", "-e", type=int, default=1000, help="End port (default: 1000)")
-    parser.add_argument("--threads", "-t", type=int, default=100, help="Number of threads (default: 100)")
-    parser.add_argument("--timeout", type=int, default=3, help="Connection timeout in seconds (default: 3)")
+    parser.add_argument("--ports", "-p",
+                       help="Port list such as 22,80,443,8000-8100 (overrides --start/--end)")
+    parser.add_argument("--per-host", type=int,
+                       help=f"Most probes in flight against one host (default: {DEFAULT_PER_HOST} "
+                            f"when scanning several hosts)")
+    parser.add_argument("--engine", choices=["asyncio", "threads"], default="asyncio",
+                       help="Scanning engine (default: asyncio)")
+    parser.add_argument("--concurrency", "-c", type=int, default=1000,
+                       help="Probes in flight for the asyncio engine (default: 1000)")
+    parser.add_argument("--threads", "-t", type=int, default=100, help="Number of threads for --engine threads (default: 100)")
+    parser.add_argument("--banner-concurrency", type=int, default=100,
+                       help="Open ports fingerprinted at once (default: 100)")
+    parser.add_argument("--fingerprint-cache", default="port_scanner_fingerprints.json",
+                       help="Fingerprints reused by later scans (default: port_scanner_fingerprints.json)")
+    parser.add_argument("--no-fingerprint-cache", action="store_true",
+                       help="Neither read nor write the fingerprint cache")
+    parser.add_argument("--output", "-o",
+                       help="Stream results to this file as they resolve ('-' for stdout)")
+    parser.add_argument("--format", "-F", choices=["jsonl", "csv"],
+                       help="Result format (default: from the --output extension, else jsonl)")
+    parser.add_argument("--all-ports", action="store_true",
+                       help="Also stream closed, filtered and unreachable ports")
+    parser.add_argument("--pps", type=float,
+                       help="Most new probes per second (token bucket; default: unlimited)")
+    parser.add_argument("--no-congestion-control", action="store_true",
+                       help="Hold --pps fixed instead of backing off (AIMD) on losses and local errors")
+    parser.add_argument("--state",
+                       help="Keep progress and results in this file; rerunning an interrupted scan resumes it")
+    parser.add_argument("--incremental", action="store_true",
+                       help="With --state: only probe known open ports and ports not swept within --stale-after")
+    parser.add_argument("--stale-after", type=float, default=STATE_MAX_AGE / 3600,
+                       help=f"Hours before a host's full sweep is redone by --incremental "
+                            f"(default: {STATE_MAX_AGE // 3600})")
+    parser.add_argument("--timeout", type=float, default=3,
+                       help="Connection timeout in seconds; the upper bound for adaptive timeouts (default: 3)")
+    parser.add_argument("--retries", type=int, default=1,
+                       help="Retries for probes that timed out before --timeout (default: 1)")
+    parser.add_argument("--no-adaptive", action="store_true",
+                       help="Always wait the full --timeout instead of timeouts from measured RTT")
     
     args = parser.parse_args()
     
@@ -163,29 +1091,72 @@ Examples:
         print("❌ Start port must be less than or equal to end port")
         sys.exit(1)
     
+    if args.incremental and not args.state:
+        print("❌ --incremental needs a --state file from an earlier scan")
+        sys.exit(1)
+    
+    ports = None
+    if args.ports:
+        try:
+            ports = parse_ports(args.ports)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    
     # Warning for localhost/local IPs only
-    if args.target not in ['localhost', '127.0.0.1', '::1'] and not args.target.startswith('192.168.'):
-        response = input(f"⚠️  You are about to scan {args.target}. Do you have permission? (yes/no): ")
+    targets = [item.strip() for spec in args.target for item in spec.split(',') if item.strip()]
+    foreign = [target for target in targets
+               if target not in ['localhost', '127.0.0.1', '::1']
+               and not target.startswith(('192.168.', '127.'))]
+    if foreign:
+        response = input(f"⚠️  You are about to scan {', '.join(foreign)}. Do you have permission? (yes/no): ")
         if response.lower() not in ['yes', 'y']:
             print("🛑 Scan cancelled. Only scan systems you own or have permission to test.")
             sys.exit(1)
     
+    result_writer = None
+    if args.output:
+        output_format = args.format or ('csv' if args.output.endswith('.csv') else 'jsonl')
+        if args.output == '-':
+            # Records own stdout; everything human-readable goes to stderr
+            result_writer = ResultWriter(sys.stdout, output_format)
+            sys.stdout = sys.stderr
+        else:
+            result_writer = ResultWriter(open(args.output, 'w', newline=''), output_format)
+    
     print("🔒 Educational Port Scanner v1.0")
     print("⚠️  For educational and authorized testing purposes only!\n")
     
     # Create and run scanner
     scanner = PortScanner(
-        target=args.target,
+        target=targets,
         start_port=args.start,
         end_port=args.end,
         threads=args.threads,
-        timeout=args.timeout
+        timeout=args.timeout,
+        engine=args.engine,
+        concurrency=args.concurrency,
+        ports=ports,
+        per_host=args.per_host,
+        adaptive=not args.no_adaptive,
+        retries=args.retries,
+        banner_concurrency=args.banner_concurrency,
+        fingerprint_cache=None if args.no_fingerprint_cache else args.fingerprint_cache,
+        result_writer=result_writer,
+        all_ports=args.all_ports,
+        pps=args.pps,
+        congestion_control=not args.no_congestion_control,
+        scan_state=ScanState(args.state) if args.state else None,
+        incremental=args.incremental,
+        stale_after=args.stale_after * 3600
     )
     
     try:
         scanner.scan()
     except KeyboardInterrupt:
         print("\n\n🛑 Scan interrupted by user")
+        if scanner.scan_state:
+            print(f"💾 Progress saved to {args.state} - run the same command again to resume")
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ Error: {e}")
@@ -0,0 +1,409 @@
+"""
+Scanner Benchmark - Educational Network Security Tool
+A fake network of services on the loopback interface, and a benchmark of the
+port scanner and network discovery engines against it
+Everything stays on 127.0.0.0/8 - no packets leave this machine
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import ipaddress
+import json
+import multiprocessing
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+
+try:
+    import resource  # Unix only - peak memory of each benchmark run
+except ImportError:
+    resource = None
+
+from network_discovery import NetworkDiscovery
+from port_scanner import PortScanner, ResultWriter, parse_ports, raise_fd_limit
+
+# What the fake services say: a greeting sent on connect, or (for "http")
+# a response once a request arrives; "silent" services accept and say nothing
+BANNERS = {
+    "ssh": b"SSH-2.0-OpenSSH_9.6p1 Ubuntu-3ubuntu13\r\n",
+    "smtp": b"220 mail.lab.local ESMTP Postfix\r\n",
+    "ftp": b"220 (vsFTPd 3.0.5)\r\n",
+    "pop3": b"+OK Dovecot ready.\r\n",
+    "imap": b"* OK [CAPABILITY IMAP4rev1] Dovecot ready.\r\n",
+    "http": b"HTTP/1.0 200 OK\r\nServer: nginx/1.24.0\r\nContent-Length: 0\r\n\r\n",
+    "silent": b""
+}
+
+# Ports the discovery tool checks on every live host (network_discovery.py)
+DISCOVERY_PORTS = [21, 22, 23, 25, 53, 80, 110, 135, 139, 143, 443, 993, 995, 3389]
+
+# Connections parked on a blackhole listener so that its accept queue stays full
+BLACKHOLE_FILLERS = 3
+
+
+class RecordSink(io.StringIO):
+    """In-memory stream for a ResultWriter that survives the writer closing it"""
+    
+    def close(self):
+        pass
+
+
+class ServiceFarm:
+    """
+    asyncio listeners on loopback addresses posing as the hosts of a small
+    network. Each host gets a random share of open ports (with a banner,
+    some accept latency and a chance of resetting the connection) and of
+    filtered ports; every other port is closed. Filtered ports are listeners
+    whose accept queue is kept full, so the kernel silently drops new SYNs -
+    the same timeout a firewall produces, without needing one.
+    """
+    
+    def __init__(self, hosts, ports, open_share=0.03, filtered_share=0.02, latency=0.0,
+                 drop=0.0, discovery_ports=0, seed=1):
+        self.hosts = hosts
+        self.ports = ports
+        self.latency = latency  # seconds before a service greets or answers
+        self.drop = drop        # share of connections reset right after the accept
+        self.random = random.Random(seed)
+        self.truth = {}         # (ip, port) -> 'open' / 'filtered'; anything else is closed
+        self.services = {}      # (ip, port) -> banner kind
+        self.servers = []
+        self.sockets = []
+        self.skipped = []       # (ip, port, error) that could not be bound
+        self.loop = None
+        self.thread = None
+        self.connections = 0
+        self.dropped = 0
+        
+        kinds = list(BANNERS)
+        for ip in hosts:
+            for port in ports:
+                roll = self.random.random()
+                if roll < open_share:
+                    self.truth[(ip, port)] = 'open'
+                    self.services[(ip, port)] = ('http' if port in (80, 8000, 8080)
+                                                 else self.random.choice(kinds))
+                elif roll < open_share + filtered_share:
+                    self.truth[(ip, port)] = 'filtered'
+            # A few well-known services for the discovery benchmark
+            for port in self.random.sample(DISCOVERY_PORTS, discovery_ports):
+                self.truth[(ip, port)] = 'open'
+                self.services[(ip, port)] = 'http' if port in (80, 443) else self.random.choice(kinds)
+    
+    async def handle(self, kind, reader, writer):
+        self.connections += 1
+        try:
+            if self.latency:
+                await asyncio.sleep(self.random.uniform(0.5, 1.5) * self.latency)
+            if self.drop and self.random.random() < self.drop:
+                # Reset instead of a clean close, like an overloaded or picky service
+                self.dropped += 1
+                sock = writer.get_extra_info('socket')
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+                writer.transport.abort()
+                return
+            if kind == 'http':
+                await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 5)
+            if BANNERS[kind]:
+                writer.write(BANNERS[kind])
+                await writer.drain()
+            await asyncio.wait_for(reader.read(1024), 5)  # until the client hangs up
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            writer.close()
+    
+    async def blackhole(self, ip, port):
+        """A listener that never accepts, with its accept queue filled up"""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((ip, port))
+        listener.listen(0)
+        self.sockets.append(listener)
+        for _ in range(BLACKHOLE_FILLERS):
+            filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            filler.setblocking(False)
+            filler.connect_ex((ip, port))
+            self.sockets.append(filler)
+            await asyncio.sleep(0.01)  # let the handshake finish before the next one
+    
+    async def start_listeners(self):
+        for (ip, port), state in sorted(self.truth.items()):
+            try:
+                if state == 'open':
+                    server = await asyncio.start_server(
+                        lambda r, w, kind=self.services[(ip, port)]: self.handle(kind, r, w),
+                        ip, port, reuse_address=True)
+                    self.servers.append(server)
+                else:
+                    await self.blackhole(ip, port)
+            except OSError as e:
+                self.skipped.append((ip, port, e.strerror))
+        for ip, port, _ in self.skipped:
+            del self.truth[(ip, port)]
+    
+    def start(self):
+        """Start every listener on an event loop in a background thread"""
+        raise_fd_limit(len(self.truth) * (BLACKHOLE_FILLERS + 2) + 1000)
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.start_listeners())
+            ready.set()
+            self.loop.run_forever()
+        
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        ready.wait()
+    
+    def stop(self):
+        for server in self.servers:
+            self.loop.call_soon_threadsafe(server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        for sock in self.sockets:
+            sock.close()
+    
+    def expected(self, ip, port):
+        return self.truth.get((ip, port), 'closed')
+    
+    def summary(self):
+        counts = {'open': 0, 'filtered': 0}
+        for state in self.truth.values():
+            counts[state] += 1
+        return counts
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_port_scanner(engine, hosts, ports, options, results):
+    """One PortScanner run (in its own process); puts elapsed time, port states and peak memory"""
+    sink = RecordSink()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scanner = PortScanner(
+            target=hosts,
+            ports=ports,
+            engine=engine,
+            timeout=options['timeout'],
+            concurrency=options['concurrency'],
+            threads=options['threads'],
+            fingerprint_cache=None,
+            result_writer=ResultWriter(sink),
+            all_ports=True
+        )
+        start = time.perf_counter()
+        scanner.scan()
+        elapsed = time.perf_counter() - start
+    states = {}
+    for line in sink.getvalue().splitlines():
+        record = json.loads(line)
+        if record.get('type') == 'port':
+            states[f"{record['host']}:{record['port']}"] = record['state']
+    results.put({'elapsed': elapsed, 'states': states, 'memory_mb': peak_memory_mb()})
+
+
+def run_discovery(method, network, options, results):
+    """One NetworkDiscovery run (in its own process); puts elapsed time, live hosts and open ports"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        discovery = NetworkDiscovery(network, threads=options['threads'], timeout=options['timeout'],
+                                     method=method)
+        start = time.perf_counter()
+        discovery.scan_network()
+        elapsed = time.perf_counter() - start
+    results.put({
+        'elapsed': elapsed,
+        'alive': list(discovery.alive_hosts),
+        'open': {ip: info['open_ports'] for ip, info in discovery.host_info.items()},
+        'memory_mb': peak_memory_mb()
+    })
+
+
+def run_isolated(target, *args):
+    """Run a benchmark function in a fresh process, so memory peaks are not shared"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=target, args=args + (results,))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def score_port_scan(farm, hosts, ports, states):
+    """Accuracy of reported port states against what the farm is serving"""
+    total = correct = found = missed = false_open = 0
+    for ip in hosts:
+        for port in ports:
+            expected = farm.expected(ip, port)
+            reported = states.get(f"{ip}:{port}", 'missing')
+            total += 1
+            correct += reported == expected
+            if expected == 'open':
+                found += reported == 'open'
+                missed += reported != 'open'
+            elif reported == 'open':
+                false_open += 1
+    return {'accuracy': correct / total, 'open_found': found, 'open_missed': missed,
+            'false_open': false_open}
+
+
+def score_discovery(farm, hosts, result):
+    expected = {(ip, port) for (ip, port), state in farm.truth.items()
+                if state == 'open' and port in DISCOVERY_PORTS}
+    reported = {(ip, port) for ip, open_ports in result['open'].items() for port in open_ports}
+    return {
+        'alive': len(result['alive']),
+        'accuracy': len(set(result['alive']) & set(hosts)) / len(hosts),  # live hosts found
+        'open_found': len(expected & reported),
+        'open_missed': len(expected - reported),
+        'false_open': len(reported - expected)
+    }
+
+
+def print_table(rows):
+    print(f"{'Engine':22s} {'Probes':>8s} {'Time':>8s} {'Rate/s':>9s} {'Accuracy':>9s} "
+          f"{'Open':>9s} {'False':>6s} {'Peak MB':>8s}")
+    print("-" * 84)
+    for row in rows:
+        memory = f"{row['memory_mb']:.1f}" if row['memory_mb'] is not None else "-"
+        print(f"{row['engine']:22s} {row['probes']:8,d} {row['elapsed']:7.2f}s "
+              f"{row['probes'] / row['elapsed']:9,.0f} {row['accuracy'] * 100:8.1f}% "
+              f"{row['open_found']:4d}/{row['open_found'] + row['open_missed']:<4d} "
+              f"{row['false_open']:6d} {memory:>8s}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the port scanner and network discovery against fake local services",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scanner_benchmark.py
+  python scanner_benchmark.py --hosts 127.0.1.0/28 --ports 20000-22047 --engines asyncio
+  python scanner_benchmark.py --latency 0.2 --drop 0.1 --filtered 0.1
+  python scanner_benchmark.py --discovery --hosts 127.0.2.0/28 --methods tcp
+  python scanner_benchmark.py --json results.json   # keep numbers to compare later runs
+  
+  # Only run the farm, then point the tools at it from another terminal
+  python scanner_benchmark.py --serve
+  python port_scanner.py 127.0.1.0/29 -p 20000-21023
+
+Hosts are 127.0.0.0/8 addresses, which Linux routes to the loopback
+interface without setup (on macOS add them with 'ifconfig lo0 alias').
+The discovery farm listens on well-known ports, which needs root.
+        """
+    )
+    
+    parser.add_argument("--hosts", default="127.0.1.0/29",
+                       help="Loopback CIDR the fake hosts live on (default: 127.0.1.0/29)")
+    parser.add_argument("--ports", "-p", default="20000-21023",
+                       help="Ports served and scanned on every host (default: 20000-21023)")
+    parser.add_argument("--open", type=float, default=0.03,
+                       help="Share of ports with a service listening (default: 0.03)")
+    parser.add_argument("--filtered", type=float, default=0.02,
+                       help="Share of ports silently dropping SYNs (default: 0.02)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                       help="Mean seconds before a service greets or answers (default: 0)")
+    parser.add_argument("--drop", type=float, default=0.0,
+                       help="Share of connections reset right after the accept (default: 0)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the farm layout (default: 1)")
+    parser.add_argument("--engines", nargs="+", choices=["asyncio", "threads"],
+                       default=["asyncio", "threads"], help="Port scanner engines to benchmark")
+    parser.add_argument("--methods", nargs="+", choices=["tcp", "ping"], default=["tcp", "ping"],
+                       help="Discovery liveness methods to benchmark with --discovery")
+    parser.add_argument("--discovery", action="store_true",
+                       help="Benchmark network discovery instead (services on its well-known ports)")
+    parser.add_argument("--timeout", type=float, default=1, help="Scanner timeout in seconds (default: 1)")
+    parser.add_argument("--concurrency", "-c", type=int, default=1000,
+                       help="Probes in flight for the asyncio engine (default: 1000)")
+    parser.add_argument("--threads", "-t", type=int, default=100,
+                       help="Threads for the threads engine and discovery (default: 100)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--serve", action="store_true", help="Only run the farm until Ctrl-C")
+    
+    args = parser.parse_args()
+    
+    try:
+        network = ipaddress.IPv4Network(args.hosts, strict=False)
+        ports = parse_ports(args.ports)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not network.is_loopback:
+        print("❌ The farm only runs on loopback addresses (127.0.0.0/8)")
+        sys.exit(1)
+    hosts = [str(ip) for ip in network.hosts()] or [str(network.network_address)]
+    
+    print("🧪 Scanner Benchmark v1.0")
+    farm = ServiceFarm(
+        hosts,
+        [] if args.discovery else ports,
+        open_share=args.open,
+        filtered_share=args.filtered,
+        latency=args.latency,
+        drop=args.drop,
+        discovery_ports=3 if args.discovery else 0,
+        seed=args.seed
+    )
+    farm.start()
+    counts = farm.summary()
+    print(f"🏗️  Farm: {len(hosts)} hosts on {network}, {counts['open']} open and "
+          f"{counts['filtered']} filtered ports, latency {args.latency}s, drop {args.drop:.0%}")
+    for ip, port, error in farm.skipped[:5]:
+        print(f"⚠️  Could not listen on {ip}:{port}: {error}")
+    if len(farm.skipped) > 5:
+        print(f"⚠️  ... and {len(farm.skipped) - 5} more ports not served")
+    
+    options = {'timeout': args.timeout, 'concurrency': args.concurrency, 'threads': args.threads}
+    rows = []
+    try:
+        if args.serve:
+            print("🟢 Serving - press Ctrl-C to stop")
+            while True:
+                time.sleep(1)
+        elif args.discovery:
+            for method in args.methods:
+                print(f"🔍 Benchmarking network discovery ({method}) on {network}...")
+                result = run_isolated(run_discovery, method, str(network), options)
+                score = score_discovery(farm, hosts, result)
+                rows.append(dict(engine=f"discovery ({method})", probes=len(hosts),
+                                 elapsed=result['elapsed'], memory_mb=result['memory_mb'], **score))
+            print("\nProbes are hosts; accuracy is the share of live hosts found, Open counts "
+                  "the well-known services found")
+            print_table(rows)
+        else:
+            for engine in args.engines:
+                print(f"🔍 Benchmarking {engine} engine on {len(hosts) * len(ports):,} ports...")
+                result = run_isolated(run_port_scanner, engine, hosts, ports, options)
+                score = score_port_scan(farm, hosts, ports, result['states'])
+                rows.append(dict(engine=engine, probes=len(hosts) * len(ports),
+                                 elapsed=result['elapsed'], memory_mb=result['memory_mb'], **score))
+            print()
+            print_table(rows)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped")
+    finally:
+        farm.stop()
+    print(f"📡 Farm served {farm.connections:,} connections ({farm.dropped:,} reset)")
+    
+    if args.json and rows:
+        with open(args.json, 'w') as f:
+            json.dump({'farm': vars(args), 'results': rows}, f, indent=2)
+        print(f"📝 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
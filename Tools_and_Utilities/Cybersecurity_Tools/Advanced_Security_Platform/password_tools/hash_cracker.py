@@ -6,36 +6,1076 @@ FOR EDUCATIONAL PURPOSES ONLY - Learn about hash security
 
 import hashlib
 import itertools
+import json
+import math
+import multiprocessing
+import os
 import string
 import time
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import platform
+import bisect
+import collections
+import sqlite3
+import functools
+import heapq
+import mmap
+import shutil
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import threading
 
+# Hash functions (module level so worker processes can look them up by name)
+HASH_FUNCTIONS = {
+    'md5': hashlib.md5,
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256,
+    'sha512': hashlib.sha512
+}
+
+# Built-in mask charsets (hashcat style)
+MASK_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    'h': string.digits + 'abcdef',
+    'H': string.digits + 'ABCDEF',
+    's': ' ' + string.punctuation,
+}
+MASK_CHARSETS['a'] = (MASK_CHARSETS['l'] + MASK_CHARSETS['u'] +
+                      MASK_CHARSETS['d'] + MASK_CHARSETS['s'])
+
+# Largest index range handed to a worker in one task (keeps checkpoints fine-grained)
+MAX_CHUNK_SIZE = 1_000_000
+
+# Most words read from a wordlist when training a Markov model
+MARKOV_TRAINING_LIMIT = 5_000_000
+
+# Wordlist files are scanned in blocks of this many bytes
+WORDLIST_BLOCK_SIZE = 1 << 20
+
+# Largest byte range of a wordlist handed to a worker in one task
+MAX_WORDLIST_CHUNK = 16 << 20
+
+# Seconds between checkpoint writes
+CHECKPOINT_INTERVAL = 5
+
+# Workers add their local attempt count to the shared counter this often
+PROGRESS_FLUSH_EVERY = 65536
+
+# Distributed mode: default coordinator port, largest lease in candidates,
+# seconds without a heartbeat before a lease is reassigned, heartbeat period
+DISTRIBUTED_PORT = 47800
+DISTRIBUTED_LEASE_SIZE = 5_000_000
+DISTRIBUTED_LEASE_TIMEOUT = 30
+DISTRIBUTED_HEARTBEAT = 5
+
+# Set in each worker process by _init_worker
+_stop_event = None  # tells workers to stop early
+_targets = None     # raw digests being searched for
+_progress = None    # shared attempt counter (multiprocessing.Value)
+
+
+def _init_worker(stop_event, targets, progress=None):
+    """Process pool initializer - share the 'found' event, targets and counter with the worker"""
+    global _stop_event, _targets, _progress
+    _stop_event = stop_event
+    _targets = targets
+    _progress = progress
+
+
+def _flush_progress(count):
+    """Add a worker's locally counted attempts to the shared counter"""
+    if _progress is not None and count:
+        with _progress.get_lock():
+            _progress.value += count
+
+
+def format_duration(seconds):
+    """Human readable duration for ETAs"""
+    if seconds >= 86400:
+        return f"{seconds / 86400:,.1f} days"
+    return time.strftime('%H:%M:%S', time.gmtime(seconds))
+
+
+class ProgressReporter(threading.Thread):
+    """
+    Background thread that prints attempts, rate, percent done and ETA.
+    Workers never report per candidate - they flush local counts to the
+    shared counter every PROGRESS_FLUSH_EVERY attempts - so the hot loops
+    stay free of synchronization.
+    """
+    
+    def __init__(self, counter, base_attempts=0, fraction=None, interval=1.0):
+        super().__init__(daemon=True)
+        self.counter = counter
+        self.base_attempts = base_attempts
+        self.fraction = fraction  # callable returning the fraction of work done
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.start_count = counter.value
+    
+    def run(self):
+        start_time = last_time = time.time()
+        start_fraction = self.fraction() if self.fraction else 0
+        last_count = self.start_count
+        
+        while not self.stopped.wait(self.interval):
+            now = time.time()
+            count = self.counter.value
+            rate = (count - last_count) / (now - last_time)
+            last_count, last_time = count, now
+            
+            line = f"   Attempts: {self.base_attempts + count - self.start_count:,} | {rate:,.0f}/s"
+            if self.fraction:
+                done = self.fraction()
+                line += f" | {done * 100:.1f}%"
+                if done > start_fraction:
+                    eta = (now - start_time) * (1 - done) / (done - start_fraction)
+                    line += f" | ETA {format_duration(eta)}"
+            print(line, flush=True)
+    
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def expand_charset(spec, custom_charsets=None):
+    """Expand a charset spec such as '?l?d_' into its characters (no duplicates)"""
+    custom_charsets = custom_charsets or {}
+    chars = []
+    i = 0
+    
+    while i < len(spec):
+        if spec[i] != '?':
+            chars.append(spec[i])
+            i += 1
+            continue
+        if i + 1 >= len(spec):
+            raise ValueError(f"Dangling '?' in charset: {spec}")
+        key = spec[i + 1]
+        if key == '?':
+            chars.append('?')
+        elif key in MASK_CHARSETS:
+            chars.extend(MASK_CHARSETS[key])
+        elif key in custom_charsets:
+            chars.extend(custom_charsets[key])
+        else:
+            raise ValueError(f"Unknown charset '?{key}' in: {spec}")
+        i += 2
+    
+    return ''.join(dict.fromkeys(chars))
+
+
+def parse_mask(mask, custom_charsets=None):
+    """
+    Parse a hashcat-style mask into one charset per position.
+    ?l ?u ?d ?h ?H ?s ?a are built in, ?1-?4 refer to custom charsets,
+    ?? is a literal '?' and any other character is a literal.
+    """
+    custom = {}
+    for key, spec in (custom_charsets or {}).items():
+        custom[str(key)] = expand_charset(spec)
+    
+    charsets = []
+    i = 0
+    while i < len(mask):
+        if mask[i] == '?':
+            charsets.append(expand_charset(mask[i:i + 2], custom))
+            i += 2
+        else:
+            charsets.append(mask[i])
+            i += 1
+    
+    if not charsets:
+        raise ValueError("Mask is empty")
+    for charset in charsets:
+        if not charset:
+            raise ValueError(f"Mask contains an empty charset: {mask}")
+    return charsets
+
+
+def keyspace_size(charsets):
+    """Number of candidates described by a list of per-position charsets"""
+    return math.prod(len(charset) for charset in charsets)
+
+
+def index_to_candidate(index, charsets, markov=None):
+    """
+    Map a keyspace index to its candidate (same order as itertools.product).
+    With a Markov table (see MarkovModel.ordered_table) each position's digit
+    instead picks from that position's characters ordered by likelihood
+    after the previous character.
+    """
+    digits = []
+    for charset in reversed(charsets):
+        index, remainder = divmod(index, len(charset))
+        digits.append(remainder)
+    digits.reverse()
+    
+    if markov is None:
+        return ''.join(charset[digit] for charset, digit in zip(charsets, digits))
+    
+    chars = []
+    previous = ''
+    for position, digit in enumerate(digits):
+        previous = markov[position][previous][digit]
+        chars.append(previous)
+    return ''.join(chars)
+
+
+class MarkovModel:
+    """
+    Character-transition statistics trained from a wordlist, used to try
+    likely candidates first. Every position's characters are reordered by
+    how often they follow the previous character in the training words.
+    Each ordering is a permutation of the position's charset, so the full
+    keyspace is still covered - only the order changes.
+    """
+    
+    def __init__(self, words, source="built-in dictionary", limit=None):
+        self.source = source
+        self.transitions = collections.defaultdict(collections.Counter)  # (position, previous) -> counts
+        self.positions = collections.defaultdict(collections.Counter)    # position -> counts
+        self.words = 0
+        
+        for word in itertools.islice(words, limit or MARKOV_TRAINING_LIMIT):
+            previous = ''
+            for position, char in enumerate(word):
+                self.transitions[(position, previous)][char] += 1
+                self.positions[position][char] += 1
+                previous = char
+            self.words += 1
+        
+        self.max_position = max(self.positions, default=0)
+    
+    def ordered_table(self, charsets):
+        """
+        Per position, map each possible previous character to that position's
+        charset sorted from most to least likely. Positions longer than any
+        training word reuse the statistics of the last trained position.
+        """
+        table = []
+        for position, charset in enumerate(charsets):
+            trained = min(position, self.max_position)
+            overall = self.positions.get(trained, collections.Counter())
+            row = {}
+            for previous in (charsets[position - 1] if position else ['']):
+                counts = self.transitions.get((trained, previous)) or overall
+                row[previous] = ''.join(sorted(charset, key=lambda c: (-counts[c], -overall[c])))
+            table.append(row)
+        return table
+
+
+def brute_force_range(hash_type, charsets, start, stop, targets=None, markov=None):
+    """
+    Try every candidate with keyspace index in [start, stop).
+    charsets holds one string of allowed characters per position.
+    Runs inside a worker process: candidates are built from their index
+    here, so nothing is generated or pickled by the parent.
+    Each candidate is hashed once and its raw digest looked up in the
+    target set (decoded from hex once, up front).
+    markov is an optional probability-ordering table for the same charsets.
+    Returns (list of (digest, password) hits, number of candidates tried).
+    """
+    hash_func = HASH_FUNCTIONS[hash_type]
+    targets = _targets if targets is None else targets
+    chars = [char.encode() for char in charsets[-1]]
+    prefix_charsets = charsets[:-1]
+    prefix_markov = markov[:-1] if markov else None
+    if markov:
+        # Last-position order depends on the prefix's final character
+        last_orders = {previous: [char.encode() for char in order]
+                       for previous, order in markov[-1].items()}
+    base = len(chars)
+    hits = []
+    tried = 0
+    flushed = 0
+    index = start
+    
+    while index < stop:
+        if _stop_event is not None and _stop_event.is_set():
+            break
+        if tried - flushed >= PROGRESS_FLUSH_EVERY:
+            _flush_progress(tried - flushed)
+            flushed = tried
+        
+        # Hash the shared prefix once, then only feed the last character
+        # into a copy of that state for each candidate
+        prefix_text = index_to_candidate(index // base, prefix_charsets, prefix_markov)
+        prefix = prefix_text.encode()
+        prefix_state = hash_func(prefix)
+        if markov:
+            chars = last_orders[prefix_text[-1:]]
+        first = index % base
+        last = min(base, first + stop - index)
+        
+        for offset, char in enumerate(chars[first:last], 1):
+            state = prefix_state.copy()
+            state.update(char)
+            digest = state.digest()
+            if digest in targets:
+                hits.append((digest, (prefix + char).decode()))
+                if len(hits) == len(targets):
+                    if _stop_event is not None:
+                        _stop_event.set()
+                    _flush_progress(tried + offset - flushed)
+                    return hits, tried + offset
+        
+        tried += last - first
+        index += last - first
+    
+    _flush_progress(tried - flushed)
+    return hits, tried
+
+
+def load_hash_file(path, hash_type):
+    """
+    Load target hashes (one hex digest per line) into a set of raw digests.
+    Blank lines and lines starting with '#' are ignored.
+    Returns (set of digests, number of invalid lines skipped).
+    """
+    hex_length = HASH_FUNCTIONS[hash_type]().digest_size * 2
+    targets = set()
+    skipped = 0
+    
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip().lower()
+            if not line or line.startswith('#'):
+                continue
+            if len(line) != hex_length or not all(c in string.hexdigits for c in line):
+                skipped += 1
+                continue
+            targets.add(bytes.fromhex(line))
+    
+    return targets, skipped
+
+
+def decode_candidate(candidate):
+    """
+    Candidate bytes -> str without losing anything: bytes that are not
+    valid UTF-8 (latin-1 wordlists...) become lone surrogates, which
+    candidate_bytes turns back into the original bytes.
+    """
+    return candidate.decode('utf-8', errors='surrogateescape')
+
+
+def candidate_bytes(password):
+    """The exact bytes that were hashed for a password from decode_candidate"""
+    return password.encode('utf-8', errors='surrogateescape')
+
+
+def display_password(password):
+    """Printable form of a password: $HEX[...] when it is not valid UTF-8"""
+    try:
+        password.encode('utf-8')
+        return password
+    except UnicodeEncodeError:
+        return f"$HEX[{candidate_bytes(password).hex()}]"
+
+
+def read_wordlist(path, start=0, end=None, with_offsets=False):
+    """
+    Stream words (bytes, never decoded) from a memory-mapped wordlist.
+    Only lines whose first byte lies in [start, end) are returned, so
+    disjoint byte ranges of one file can be scanned by different workers.
+    With with_offsets, (byte offset, word) pairs are yielded instead.
+    """
+    size = os.path.getsize(path)
+    end = size if end is None else min(end, size)
+    if start >= end:
+        return
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # A line straddling start belongs to the previous range
+        if start > 0 and mm[start - 1] != ord('\n'):
+            newline = mm.find(b'\n', start)
+            start = size if newline == -1 else newline + 1
+        
+        position = start
+        while position < end:
+            # Extend each block to the end of the line that crosses its boundary
+            block_end = min(position + WORDLIST_BLOCK_SIZE, end)
+            newline = mm.find(b'\n', block_end - 1)
+            stop = size if newline == -1 else newline + 1
+            
+            line_start = position
+            for line in mm[position:stop].split(b'\n'):
+                word = line.rstrip(b'\r')
+                if word:
+                    yield (line_start, word) if with_offsets else word
+                line_start += len(line) + 1
+            position = stop
+
+
+def wordlist_range(hash_type, path, rules, start, end, targets=None):
+    """
+    Hash every word (after rules) of a wordlist byte range [start, end).
+    Runs inside a worker process. Returns (hits, number of candidates tried).
+    """
+    hash_func = HASH_FUNCTIONS[hash_type]
+    targets = _targets if targets is None else targets
+    candidates = read_wordlist(path, start, end)
+    if rules:
+        candidates = apply_rules(candidates, [parse_rule(rule) for rule in rules])
+    
+    hits = {}  # digest -> password; repeated words and rule outputs hit the same target
+    tried = 0
+    flushed = 0
+    for tried, candidate in enumerate(candidates, 1):
+        if tried % PROGRESS_FLUSH_EVERY == 0:
+            _flush_progress(tried - flushed)
+            flushed = tried
+            if _stop_event is not None and _stop_event.is_set():
+                break
+        digest = hash_func(candidate).digest()
+        if digest in targets and digest not in hits:
+            hits[digest] = decode_candidate(candidate)
+            if len(hits) == len(targets):
+                if _stop_event is not None:
+                    _stop_event.set()
+                break
+    
+    _flush_progress(tried - flushed)
+    return list(hits.items()), tried
+
+
+def _toggle_at(position):
+    """Rule step: toggle the case of the character at position"""
+    def step(word):
+        if position >= len(word):
+            return word
+        return word[:position] + word[position:position + 1].swapcase() + word[position + 1:]
+    return step
+
+
+# Hashcat-style rule functions that take no argument
+RULE_FUNCTIONS = {
+    ':': lambda word: word,
+    'l': lambda word: word.lower(),
+    'u': lambda word: word.upper(),
+    'c': lambda word: word.capitalize(),
+    'C': lambda word: word[:1].lower() + word[1:].upper(),
+    't': lambda word: word.swapcase(),
+    'r': lambda word: word[::-1],
+    'd': lambda word: word + word,
+    'f': lambda word: word + word[::-1],
+    '[': lambda word: word[1:],
+    ']': lambda word: word[:-1],
+}
+
+
+def parse_rule(rule):
+    """
+    Compile a hashcat-style rule (e.g. 'c $1 $2 $3' or 'sa@ so0') into a list of steps.
+    Supported: : l u c C t r d f [ ] TN $X ^X sXY
+    """
+    steps = []
+    i = 0
+    
+    while i < len(rule):
+        op = rule[i]
+        if op in ' \t':
+            i += 1
+        elif op in RULE_FUNCTIONS:
+            steps.append(RULE_FUNCTIONS[op])
+            i += 1
+        elif op in '$^' and i + 1 < len(rule):
+            char = rule[i + 1].encode()
+            if op == '$':
+                steps.append(lambda word, char=char: word + char)
+            else:
+                steps.append(lambda word, char=char: char + word)
+            i += 2
+        elif op == 's' and i + 2 < len(rule):
+            old, new = rule[i + 1].encode(), rule[i + 2].encode()
+            steps.append(lambda word, old=old, new=new: word.replace(old, new))
+            i += 3
+        elif op == 'T' and i + 1 < len(rule) and rule[i + 1].isdigit():
+            steps.append(_toggle_at(int(rule[i + 1])))
+            i += 2
+        else:
+            raise ValueError(f"Invalid rule '{rule}' at position {i}")
+    
+    return steps
+
+
+def default_rules():
+    """Built-in rule set: case changes, leetspeak, reversal, duplication, digits and years"""
+    rules = [':', 'l', 'u', 'c', 'C', 't', 'r', 'd', 'f',
+             'sa@', 'se3', 'si1', 'so0', 'ss$', 'sa@se3si1so0', 'c sa@se3si1so0',
+             '$!', '$@', '$1$2$3', 'c $1', 'c $!', 'c $1$2$3', 'u $1', '^1', '^!']
+    rules += [f'${digit}' for digit in range(10)]
+    rules += [f'^{digit}' for digit in range(10)]
+    rules += [f'${a}${b}' for a in range(10) for b in range(10)]
+    for year in range(1990, 2031):
+        append_year = ''.join(f'${c}' for c in str(year))
+        rules += [append_year, 'c ' + append_year]
+    return rules
+
+
+def load_rules(path):
+    """
+    Load one rule per line from a file ('default' selects the built-in set).
+    Rules are validated here but returned as strings so they can be sent
+    to worker processes; compile them with parse_rule.
+    """
+    if path == 'default':
+        lines = default_rules()
+    else:
+        with open(path, 'r') as f:
+            lines = [line.rstrip('\r\n') for line in f]
+    
+    rules = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip() or line.startswith('#'):
+            continue
+        try:
+            parse_rule(line)
+        except ValueError as e:
+            raise ValueError(f"{path}:{number}: {e}")
+        rules.append(line)
+    return rules
+
+
+def apply_rules(words, rules):
+    """
+    Lazily yield every rule applied to every word.
+    Only one word's variants are held at a time, so memory stays constant
+    no matter how large the wordlist or rule set is.
+    """
+    for word in words:
+        seen = set()
+        for rule in rules:
+            candidate = word
+            for step in rule:
+                candidate = step(candidate)
+            if candidate and candidate not in seen:
+                seen.add(candidate)
+                yield candidate
+
+
+# Target wall time of one PBKDF2 work unit; batch sizes are derived from it
+PBKDF2_BATCH_SECONDS = 1.0
+
+# Iteration count used by SecureUserAuth and SecureBankDatabase
+PBKDF2_DEFAULT_ITERATIONS = 100_000
+
+
+def load_salted_hashes(path):
+    """
+    Load salted password hashes from a SecureUserAuth users.json file or a
+    SecureBankDatabase SQLite file (users table).
+    Returns a list of (username, salt bytes, raw digest).
+    """
+    if path.endswith(('.db', '.sqlite', '.sqlite3')):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute("SELECT username, password_hash, salt FROM users").fetchall()
+        finally:
+            conn.close()
+    else:
+        with open(path, 'r') as f:
+            users = json.load(f)
+        rows = [(name, user['password_hash'], user['salt']) for name, user in users.items()]
+    
+    # Both stores feed the hex salt string itself (not its bytes) into PBKDF2
+    return [(username, salt.encode('utf-8'), bytes.fromhex(password_hash))
+            for username, password_hash, salt in rows]
+
+
+def pbkdf2_batch(algorithm, iterations, salt, expected, candidates):
+    """
+    Evaluate PBKDF2 for a batch of candidates against one salt/hash pair.
+    Runs inside a worker process. Returns (password or None, candidates tried).
+    """
+    for tried, candidate in enumerate(candidates, 1):
+        if hashlib.pbkdf2_hmac(algorithm, candidate, salt, iterations) == expected:
+            return decode_candidate(candidate), tried
+    return None, len(candidates)
+
+
+# Benchmark keyspace: lowercase + digits, long enough for any benchmark size
+BENCHMARK_CHARSET = string.ascii_lowercase + string.digits
+BENCHMARK_LENGTH = 8
+
+
+def measure_phases(hash_type, size):
+    """
+    Time candidate generation, hashing and target comparison separately,
+    in this process, for size candidates. Returns seconds per phase.
+    """
+    hash_func = HASH_FUNCTIONS[hash_type]
+    charsets = [BENCHMARK_CHARSET] * BENCHMARK_LENGTH
+    chars = [char.encode() for char in BENCHMARK_CHARSET]
+    base = len(chars)
+    targets = {os.urandom(hash_func().digest_size)}
+    
+    start = time.perf_counter()
+    candidates = []
+    for prefix_index in range(-(-size // base)):
+        prefix = index_to_candidate(prefix_index, charsets[:-1]).encode()
+        candidates.extend(prefix + char for char in chars)
+    del candidates[size:]
+    generation = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    digests = [hash_func(candidate).digest() for candidate in candidates]
+    hashing = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for digest in digests:
+        digest in targets
+    compare = time.perf_counter() - start
+    
+    return {'generation': generation, 'hashing': hashing, 'compare': compare}
+
+
+def measure_throughput(hash_type, workers, size):
+    """End-to-end candidates/second of the process-pool engine on a fixed keyspace"""
+    cracker = HashCracker(os.urandom(HASH_FUNCTIONS[hash_type]().digest_size).hex(),
+                          hash_type=hash_type, workers=workers)
+    cracker.verbose = False
+    charsets = [BENCHMARK_CHARSET] * BENCHMARK_LENGTH
+    stop_event = multiprocessing.Event()
+    
+    with cracker.create_pool(stop_event) as executor:
+        # Start every worker process before the clock starts
+        warmup = [executor.submit(brute_force_range, hash_type, charsets, 0, 1)
+                  for _ in range(workers)]
+        wait(warmup)
+        
+        task = functools.partial(brute_force_range, hash_type, charsets)
+        chunk_size = max(1_000, min(MAX_CHUNK_SIZE, size // (workers * 16)))
+        start = time.perf_counter()
+        cracker.run_ranges(executor, stop_event, task, 0, size, chunk_size)
+        elapsed = time.perf_counter() - start
+    
+    return cracker.attempts / elapsed
+
+
+def run_benchmark(max_workers, size, algorithms=None, json_path=None):
+    """
+    Measure candidates/second for each algorithm at 1..max_workers workers,
+    plus the per-phase cost breakdown. Prints tables and writes JSON.
+    """
+    algorithms = algorithms or list(HASH_FUNCTIONS)
+    report = {
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'machine': {'cpu_count': os.cpu_count(), 'platform': platform.platform(),
+                    'python': platform.python_version()},
+        'keyspace_size': size,
+        'algorithms': {}
+    }
+    
+    print(f"🏁 Hash Cracker Benchmark - {size:,} candidates per run, 1..{max_workers} workers")
+    print("=" * 60)
+    
+    for algorithm in algorithms:
+        phases = measure_phases(algorithm, size)
+        phase_total = sum(phases.values())
+        runs = []
+        for workers in range(1, max_workers + 1):
+            rate = measure_throughput(algorithm, workers, size)
+            single_rate = runs[0]['candidates_per_second'] if runs else rate
+            runs.append({
+                'workers': workers,
+                'candidates_per_second': round(rate),
+                'speedup': round(rate / single_rate, 2),
+                'efficiency': round(rate / (single_rate * workers), 3)
+            })
+        
+        report['algorithms'][algorithm] = {
+            'phases_ns_per_candidate': {name: round(seconds / size * 1e9, 1)
+                                        for name, seconds in phases.items()},
+            'runs': runs
+        }
+        
+        print(f"\n🔍 {algorithm.upper()}")
+        print(f"   {'Workers':>7}  {'Candidates/s':>14}  {'Speedup':>7}  {'Efficiency':>10}")
+        for run in runs:
+            print(f"   {run['workers']:>7}  {run['candidates_per_second']:>14,}  "
+                  f"{run['speedup']:>6.2f}x  {run['efficiency'] * 100:>9.0f}%")
+        print(f"   Phases (one process): " + ", ".join(
+            f"{name} {seconds / size * 1e9:.0f} ns ({seconds / phase_total * 100:.0f}%)"
+            for name, seconds in phases.items()))
+    
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 JSON report written to {json_path}")
+    
+    return report
+
+
+# Lookup table file layout: magic, 4-byte header length, JSON header, then
+# fixed-size records of (digest prefix, candidate offset) sorted by prefix
+TABLE_MAGIC = b'HCTABLE1'
+TABLE_PREFIX_BYTES = 8
+TABLE_RECORD_SIZE = TABLE_PREFIX_BYTES + 8
+
+# Records sorted in memory by one worker before being written as a run file
+TABLE_RUN_RECORDS = 2_000_000
+
+# Most run files merged at once (stays well below open file limits)
+TABLE_MERGE_FAN_IN = 128
+
+# Potfile is rewritten without duplicate/corrupt lines once it holds at
+# least this many lines and more than twice as many lines as entries
+POTFILE_COMPACT_MIN_LINES = 10_000
+
+
+def _table_keyspaces(source):
+    """Per-mask charsets and their starting global index for a mask table source"""
+    keyspaces = []
+    base = 0
+    for mask in source['masks']:
+        charsets = parse_mask(mask, source.get('custom_charsets'))
+        keyspaces.append((base, charsets))
+        base += keyspace_size(charsets)
+    return keyspaces, base
+
+
+def table_run(hash_type, source, start, end, run_path):
+    """
+    Hash the candidates with offsets in [start, end) and write their records,
+    sorted, to run_path. Mask ranges never span two masks. Runs in a worker.
+    Returns the number of records written.
+    """
+    hash_func = HASH_FUNCTIONS[hash_type]
+    records = []
+    
+    if source['type'] == 'wordlist':
+        for offset, word in read_wordlist(source['path'], start, end, with_offsets=True):
+            records.append(hash_func(word).digest()[:TABLE_PREFIX_BYTES] +
+                           offset.to_bytes(8, 'big'))
+    else:
+        keyspaces, _ = _table_keyspaces(source)
+        mask_base, charsets = [ks for ks in keyspaces if ks[0] <= start][-1]
+        chars = [char.encode() for char in charsets[-1]]
+        base = len(chars)
+        index = start - mask_base
+        stop = end - mask_base
+        
+        while index < stop:
+            prefix_state = hash_func(index_to_candidate(index // base, charsets[:-1]).encode())
+            first = index % base
+            last = min(base, first + stop - index)
+            for position in range(first, last):
+                state = prefix_state.copy()
+                state.update(chars[position])
+                offset = mask_base + index - first + position
+                records.append(state.digest()[:TABLE_PREFIX_BYTES] + offset.to_bytes(8, 'big'))
+            index += last - first
+    
+    records.sort()
+    with open(run_path, 'wb') as f:
+        f.write(b''.join(records))
+    return len(records)
+
+
+def _iter_records(path):
+    """Read fixed-size records back from a run file in large blocks"""
+    block_size = TABLE_RECORD_SIZE * 8192
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            for i in range(0, len(block), TABLE_RECORD_SIZE):
+                yield block[i:i + TABLE_RECORD_SIZE]
+
+
+def _merge_runs(run_paths, output):
+    """k-way merge of sorted run files into output (an open binary file)"""
+    buffer = []
+    for record in heapq.merge(*(_iter_records(path) for path in run_paths)):
+        buffer.append(record)
+        if len(buffer) >= 65536:
+            output.write(b''.join(buffer))
+            buffer = []
+    output.write(b''.join(buffer))
+
+
+def build_lookup_table(output, hash_type, masks=None, custom_charsets=None,
+                       wordlist=None, workers=None):
+    """
+    Precompute a sorted on-disk lookup table for one hash algorithm.
+    Candidates come from masks (offset = global keyspace index) or from a
+    wordlist (offset = byte offset of the line), so plaintexts are never
+    stored. Workers hash and sort runs in parallel, then runs are merged.
+    Returns the number of records written.
+    """
+    workers = workers or os.cpu_count() or 1
+    
+    if wordlist:
+        wordlist = os.path.abspath(wordlist)
+        size = os.path.getsize(wordlist)
+        source = {'type': 'wordlist', 'path': wordlist, 'size': size}
+        # Roughly TABLE_RUN_RECORDS lines per range, assuming ~10 bytes per line
+        ranges = [(start, min(start + TABLE_RUN_RECORDS * 10, size))
+                  for start in range(0, size, TABLE_RUN_RECORDS * 10)]
+    else:
+        source = {'type': 'mask', 'masks': list(masks), 'custom_charsets': custom_charsets or {}}
+        keyspaces, total = _table_keyspaces(source)
+        ranges = []
+        for mask_base, charsets in keyspaces:
+            mask_end = mask_base + keyspace_size(charsets)
+            for start in range(mask_base, mask_end, TABLE_RUN_RECORDS):
+                ranges.append((start, min(start + TABLE_RUN_RECORDS, mask_end)))
+    
+    header = json.dumps({'hash_type': hash_type, 'prefix_bytes': TABLE_PREFIX_BYTES,
+                         'source': source}).encode()
+    run_dir = tempfile.mkdtemp(prefix='hash_table_', dir=os.path.dirname(os.path.abspath(output)))
+    
+    try:
+        run_paths = [os.path.join(run_dir, f'run{i:06d}.bin') for i in range(len(ranges))]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(table_run, hash_type, source, start, end, run_path)
+                       for (start, end), run_path in zip(ranges, run_paths)]
+            count = 0
+            for done, future in enumerate(futures, 1):
+                count += future.result()
+                print(f"   Hashed and sorted run {done}/{len(futures)} ({count:,} records)")
+        
+        # Merge in passes if there are more runs than can be opened at once
+        generation = 0
+        while len(run_paths) > TABLE_MERGE_FAN_IN:
+            merged_paths = []
+            for i in range(0, len(run_paths), TABLE_MERGE_FAN_IN):
+                merged_path = os.path.join(run_dir, f'merge{generation}_{i:06d}.bin')
+                with open(merged_path, 'wb') as f:
+                    _merge_runs(run_paths[i:i + TABLE_MERGE_FAN_IN], f)
+                for path in run_paths[i:i + TABLE_MERGE_FAN_IN]:
+                    os.remove(path)
+                merged_paths.append(merged_path)
+            run_paths = merged_paths
+            generation += 1
+        
+        temp_output = output + '.tmp'
+        with open(temp_output, 'wb') as f:
+            f.write(TABLE_MAGIC + struct.pack('>I', len(header)) + header)
+            _merge_runs(run_paths, f)
+        os.replace(temp_output, output)
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    
+    return count
+
+
+class LookupTable:
+    """Memory-mapped, sorted lookup table built by build_lookup_table"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if self.mm[:len(TABLE_MAGIC)] != TABLE_MAGIC:
+            raise ValueError(f"Not a lookup table: {path}")
+        header_length = struct.unpack('>I', self.mm[len(TABLE_MAGIC):len(TABLE_MAGIC) + 4])[0]
+        header_start = len(TABLE_MAGIC) + 4
+        header = json.loads(self.mm[header_start:header_start + header_length])
+        
+        self.hash_type = header['hash_type']
+        self.source = header['source']
+        self.data_offset = header_start + header_length
+        self.count = (len(self.mm) - self.data_offset) // TABLE_RECORD_SIZE
+        self.hash_func = HASH_FUNCTIONS[self.hash_type]
+        
+        if self.source['type'] == 'wordlist':
+            if os.path.getsize(self.source['path']) != self.source['size']:
+                raise ValueError(f"Wordlist {self.source['path']} changed since the table was built")
+            self.wordlist_file = open(self.source['path'], 'rb')
+            self.wordlist = mmap.mmap(self.wordlist_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.keyspaces, _ = _table_keyspaces(self.source)
+            self.mask_bases = [mask_base for mask_base, _ in self.keyspaces]
+    
+    def prefix_at(self, i):
+        """Digest prefix of record i"""
+        start = self.data_offset + i * TABLE_RECORD_SIZE
+        return self.mm[start:start + TABLE_PREFIX_BYTES]
+    
+    def candidate_at(self, offset):
+        """Recover the plaintext a record points to"""
+        if self.source['type'] == 'wordlist':
+            end = self.wordlist.find(b'\n', offset)
+            end = len(self.wordlist) if end == -1 else end
+            return self.wordlist[offset:end].rstrip(b'\r')
+        
+        mask_base, charsets = self.keyspaces[bisect.bisect_right(self.mask_bases, offset) - 1]
+        return index_to_candidate(offset - mask_base, charsets).encode()
+    
+    def lookup(self, digest):
+        """Binary search for a raw digest; returns the password or None"""
+        prefix = digest[:TABLE_PREFIX_BYTES]
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.prefix_at(middle) < prefix:
+                low = middle + 1
+            else:
+                high = middle
+        
+        # Several candidates can share a prefix: verify each against the full digest
+        while low < self.count and self.prefix_at(low) == prefix:
+            start = self.data_offset + low * TABLE_RECORD_SIZE + TABLE_PREFIX_BYTES
+            offset = int.from_bytes(self.mm[start:start + 8], 'big')
+            candidate = self.candidate_at(offset)
+            if self.hash_func(candidate).digest() == digest:
+                return decode_candidate(candidate)
+            low += 1
+        return None
+    
+    def close(self):
+        self.mm.close()
+        self.file.close()
+        if self.source['type'] == 'wordlist':
+            self.wordlist.close()
+            self.wordlist_file.close()
+
+
+class Potfile:
+    """
+    Append-only store of every hash cracked so far, shared across runs.
+    Each line is algorithm:hex digest:password (passwords containing
+    newlines or non-UTF-8 bytes are written as $HEX[...] of their raw
+    bytes, see decode_candidate). The whole file is
+    loaded into a dict on startup; every hit is appended with a single
+    O_APPEND write, so a crash can at worst leave one torn final line,
+    which is ignored on the next load.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.entries = collections.defaultdict(dict)  # algorithm -> {digest: password}
+        self.lines = 0
+        self.torn = False
+        self.load()
+        if self.lines >= POTFILE_COMPACT_MIN_LINES and self.lines > 2 * len(self):
+            self.compact()
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        if self.torn:
+            os.write(self.fd, b'\n')  # keep the next hit off the torn line
+    
+    def __len__(self):
+        return sum(len(digests) for digests in self.entries.values())
+    
+    @staticmethod
+    def encode_password(password):
+        if ('\n' in password or '\r' in password or password.startswith('$HEX[')
+                or display_password(password) != password):
+            return f"$HEX[{candidate_bytes(password).hex()}]"
+        return password
+    
+    @staticmethod
+    def decode_password(text):
+        if text.startswith('$HEX[') and text.endswith(']'):
+            return decode_candidate(bytes.fromhex(text[5:-1]))
+        return text
+    
+    def load(self):
+        """Read every well-formed line; later lines win"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8', errors='surrogateescape', newline='\n') as f:
+            for line in f:
+                self.lines += 1
+                if not line.endswith('\n'):
+                    self.torn = True  # torn write from an interrupted run
+                    continue
+                parts = line[:-1].split(':', 2)
+                if len(parts) != 3 or parts[0] not in HASH_FUNCTIONS:
+                    continue
+                algorithm, hex_digest, password = parts
+                try:
+                    digest = bytes.fromhex(hex_digest)
+                    password = self.decode_password(password)
+                except ValueError:
+                    continue
+                if len(digest) == HASH_FUNCTIONS[algorithm]().digest_size:
+                    self.entries[algorithm][digest] = password
+    
+    def compact(self):
+        """Atomically rewrite the file with one line per entry"""
+        temp_file = self.path + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8', newline='\n') as f:
+            for algorithm, digests in self.entries.items():
+                for digest, password in digests.items():
+                    f.write(f"{algorithm}:{digest.hex()}:{self.encode_password(password)}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.path)
+        self.torn = False
+        print(f"🧹 Compacted potfile {self.path}: {self.lines:,} -> {len(self):,} lines")
+        self.lines = len(self)
+    
+    def lookup(self, algorithm, digest):
+        return self.entries[algorithm].get(digest)
+    
+    def add(self, algorithm, digest, password):
+        """Append a hit unless the potfile already has it"""
+        if self.entries[algorithm].get(digest) == password:
+            return
+        self.entries[algorithm][digest] = password
+        line = f"{algorithm}:{digest.hex()}:{self.encode_password(password)}\n"
+        os.write(self.fd, line.encode('utf-8'))
+        self.lines += 1
+    
+    def close(self):
+        os.close(self.fd)
+
+
 class HashCracker:
-    def __init__(self, hash_value, hash_type="md5", max_length=6, threads=4):
-        self.hash_value = hash_value.lower()
+    def __init__(self, hash_value=None, hash_type="md5", max_length=6, workers=None,
+                 hash_file=None, potfile=None, targets=None):
         self.hash_type = hash_type.lower()
         self.max_length = max_length
-        self.threads = threads
+        self.workers = workers or os.cpu_count() or 1
         self.found = False
         self.result = None
+        self.results = {}  # hex digest -> password
         self.attempts = 0
         self.lock = threading.Lock()
+        self.verbose = True  # progress lines from run_ranges
+        self.progress_counter = None  # shared with pool workers, see create_pool
+        self.potfile = potfile  # Potfile of earlier hits, checked first and kept up to date
         
-        # Hash functions
-        self.hash_functions = {
-            'md5': hashlib.md5,
-            'sha1': hashlib.sha1,
-            'sha256': hashlib.sha256,
-            'sha512': hashlib.sha512
-        }
+        self.hash_functions = HASH_FUNCTIONS
         
         if self.hash_type not in self.hash_functions:
             raise ValueError(f"Unsupported hash type: {hash_type}")
         
         self.hash_func = self.hash_functions[self.hash_type]
         
+        # Targets are kept as raw digests so every candidate is a single set lookup
+        if hash_file:
+            self.targets, skipped = load_hash_file(hash_file, self.hash_type)
+            if skipped:
+                print(f"⚠️  Skipped {skipped} invalid lines in {hash_file}")
+            if not self.targets:
+                raise ValueError(f"No valid {self.hash_type.upper()} hashes in {hash_file}")
+        elif hash_value:
+            self.targets = {bytes.fromhex(hash_value)}
+        elif targets:
+            self.targets = {bytes.fromhex(target) for target in targets}
+        else:
+            raise ValueError("Provide a hash value or a hash file")
+        
+        self.hash_value = hash_value.lower() if hash_value else None
+        self.multi_target = len(self.targets) > 1
+        self.remaining = set(self.targets)
+        
+        self.build_dictionary()
+    
+    def build_dictionary(self):
+        """Build the built-in common password dictionary"""
         # Common passwords dictionary
         self.common_passwords = [
                         # Common numeric passwords
@@ -88,166 +1128,462 @@ class HashCracker:
             self.extended_dict.append(letter * 2)  # aa, bb, cc, etc.
             self.extended_dict.append(letter * 3)  # aaa, bbb, ccc, etc.
     
-    def hash_string(self, text):
-        """Hash a string using the specified algorithm"""
-        return self.hash_func(text.encode()).hexdigest()
+    def record_result(self, digest, password):
+        """Record a cracked target and stream it out immediately"""
+        with self.lock:
+            if digest not in self.remaining:
+                return False
+            self.remaining.discard(digest)
+            self.results[digest.hex()] = password
+            self.result = password
+            if not self.remaining:
+                self.found = True
+            if self.potfile is not None:
+                self.potfile.add(self.hash_type, digest, password)
+        
+        if self.multi_target:
+            print(f"✅ {digest.hex()}:{display_password(password)}", flush=True)
+        else:
+            print(f"✅ Password found: '{display_password(password)}'", flush=True)
+        return True
     
-    def dictionary_attack(self):
-        """Try dictionary attack with common passwords"""
+    def dictionary_attack(self, wordlist=None, rules=None):
+        """
+        Try dictionary attack with common passwords, or with an external
+        wordlist (see wordlist_attack). Rules (from load_rules) are applied
+        lazily to every word.
+        """
+        if wordlist:
+            return self.wordlist_attack(wordlist, rules)
+        
         print(f"🔍 Starting dictionary attack with {len(self.extended_dict)} words...")
+        candidates = (word.encode() for word in self.extended_dict)
+        if rules:
+            print(f"   Applying {len(rules)} rules to every word")
+            candidates = apply_rules(candidates, [parse_rule(rule) for rule in rules])
         
         start_time = time.time()
+        cracked_before = len(self.results)
         
-        for i, password in enumerate(self.extended_dict):
-            if self.found:
-                break
-                
-            with self.lock:
-                self.attempts += 1
-            
-            if self.hash_string(password) == self.hash_value:
-                with self.lock:
-                    if not self.found:
-                        self.found = True
-                        self.result = password
-                        elapsed = time.time() - start_time
-                        print(f"✅ Password found: '{password}'")
-                        print(f"⏰ Time: {elapsed:.2f} seconds")
-                        print(f"🔢 Attempts: {self.attempts}")
-                        return True
+        # Hot loop: raw digests only, no hex strings
+        hash_func = self.hash_func
+        remaining = self.remaining
+        i = 0
+        
+        for i, candidate in enumerate(candidates, 1):
+            digest = hash_func(candidate).digest()
+            if digest in remaining:
+                self.record_result(digest, decode_candidate(candidate))
+                if self.found:
+                    break
             
-            if i % 1000 == 0 and i > 0:
+            if i % 1_000_000 == 0:
                 print(f"   Tried {i:,} passwords...")
         
+        self.attempts += i
+        
         elapsed = time.time() - start_time
-        print(f"❌ Dictionary attack failed after {elapsed:.2f} seconds")
+        if self.found:
+            print(f"⏰ Time: {elapsed:.2f} seconds")
+            print(f"🔢 Attempts: {self.attempts}")
+            return True
+        
+        if self.multi_target:
+            print(f"📊 Dictionary attack cracked {len(self.results) - cracked_before} hashes "
+                  f"in {elapsed:.2f} seconds ({len(self.remaining)} remaining)")
+        else:
+            print(f"❌ Dictionary attack failed after {elapsed:.2f} seconds")
         print(f"🔢 Total attempts: {self.attempts}")
         return False
     
-    def brute_force_worker(self, passwords_chunk):
-        """Worker function for brute force attack"""
-        for password in passwords_chunk:
-            if self.found:
-                break
-                
-            with self.lock:
-                self.attempts += 1
-                if self.attempts % 100000 == 0:
-                    print(f"   Attempts: {self.attempts:,}")
+    def potfile_lookup(self):
+        """Resolve targets already cracked in an earlier run"""
+        cracked_before = len(self.results)
+        for digest in list(self.remaining):
+            password = self.potfile.lookup(self.hash_type, digest)
+            if password is not None:
+                self.record_result(digest, password)
+        
+        cracked = len(self.results) - cracked_before
+        if cracked:
+            print(f"📒 {cracked:,} hashes were already in the potfile {self.potfile.path}")
+        return self.found
+    
+    def table_lookup(self, tables):
+        """Look every remaining target up in precomputed tables (no hashing runs)"""
+        start_time = time.time()
+        cracked_before = len(self.results)
+        
+        for table in tables:
+            if table.hash_type != self.hash_type:
+                print(f"⚠️  Skipping {table.path}: built for {table.hash_type.upper()}")
+                continue
             
-            if self.hash_string(password) == self.hash_value:
-                with self.lock:
-                    if not self.found:
-                        self.found = True
-                        self.result = password
-                return password
-        return None
+            print(f"📖 Looking up {len(self.remaining):,} hashes in {table.path} "
+                  f"({table.count:,} entries)...")
+            for digest in list(self.remaining):
+                password = table.lookup(digest)
+                if password is not None:
+                    self.record_result(digest, password)
+        
+        elapsed = time.time() - start_time
+        print(f"   Table lookup cracked {len(self.results) - cracked_before} hashes "
+              f"in {elapsed * 1000:.2f} ms")
+        return self.found
     
-    def generate_passwords(self, length):
-        """Generate all possible passwords of given length"""
+    def wordlist_attack(self, wordlist, rules=None):
+        """
+        Dictionary attack over an external wordlist of any size.
+        The file is memory-mapped and split into byte ranges; each worker
+        scans its own range, so nothing is loaded up front.
+        """
+        size = os.path.getsize(wordlist)
+        print(f"🔍 Starting dictionary attack with wordlist {wordlist} ({size:,} bytes)...")
+        if rules:
+            print(f"   Applying {len(rules)} rules to every word")
+        
+        start_time = time.time()
+        cracked_before = len(self.results)
+        chunk_size = min(MAX_WORDLIST_CHUNK, max(1 << 16, size // (self.workers * 16)))
+        task = functools.partial(wordlist_range, self.hash_type, wordlist, rules)
+        stop_event = multiprocessing.Event()
+        
+        with self.create_pool(stop_event) as executor:
+            self.run_ranges(executor, stop_event, task, 0, size, chunk_size, unit="wordlist")
+        
+        elapsed = time.time() - start_time
+        if self.found:
+            print(f"⏰ Time: {elapsed:.2f} seconds")
+            print(f"🔢 Attempts: {self.attempts:,}")
+            return True
+        
+        if self.multi_target:
+            print(f"📊 Dictionary attack cracked {len(self.results) - cracked_before} hashes "
+                  f"in {elapsed:.2f} seconds ({len(self.remaining)} remaining)")
+        else:
+            print(f"❌ Dictionary attack failed after {elapsed:.2f} seconds")
+        print(f"🔢 Total attempts: {self.attempts:,}")
+        return False
+    
+    def charset_for_length(self, length):
+        """Character set used by brute force for a given length"""
         # Use common characters (letters, digits, basic symbols)
         chars = string.ascii_lowercase + string.digits
         if length > 4:  # Add uppercase and symbols for longer passwords
             chars += string.ascii_uppercase + "!@#$"
+        return chars
+    
+    def create_pool(self, stop_event):
+        """Process pool whose workers share the stop event, remaining targets and attempt counter"""
+        self.progress_counter = multiprocessing.Value('Q', 0)
+        return ProcessPoolExecutor(max_workers=self.workers,
+                                   initializer=_init_worker,
+                                   initargs=(stop_event, frozenset(self.remaining),
+                                             self.progress_counter))
+    
+    def run_keyspace(self, executor, stop_event, charsets, start=0, on_progress=None,
+                     markov=None):
+        """
+        Search the keyspace described by per-position charsets, from index start,
+        optionally in the probability order of a MarkovModel.
+        Returns the offset below which every index has been tried.
+        """
+        total = keyspace_size(charsets)
+        chunk_size = min(MAX_CHUNK_SIZE, max(10_000, (total - start) // (self.workers * 16)))
+        table = markov.ordered_table(charsets) if markov else None
+        task = functools.partial(brute_force_range, self.hash_type, charsets, markov=table)
+        return self.run_ranges(executor, stop_event, task, start, total, chunk_size,
+                               on_progress, unit="keyspace")
+    
+    def run_ranges(self, executor, stop_event, task, start, total, chunk_size,
+                   on_progress=None, unit="keyspace", abort=None):
+        """
+        Split [start, total) into ranges and run task(range_start, range_end)
+        on the pool with a bounded number in flight. Each task returns
+        (hits, tried). on_progress(offset) is called with the offset below
+        which every range has finished. Returns that offset.
+        unit is "keyspace" (offsets are candidates) or "wordlist" (bytes);
+        it decides how the progress reporter estimates percent done.
+        Setting the optional abort event (from another thread) gives up on
+        the rest of the range; stop_event is then set and must be cleared
+        before the pool is used again.
+        """
+        window = self.workers * 4
         
-        for password in itertools.product(chars, repeat=length):
-            if self.found:
-                break
-            yield ''.join(password)
+        next_start = start
+        offset = start
+        pending = {}    # future -> (chunk start, chunk end)
+        completed = {}  # chunk start -> chunk end, for chunks finished above offset
+        
+        reporter = None
+        if self.verbose and self.progress_counter is not None and total:
+            counter = self.progress_counter
+            baseline = counter.value
+            if unit == "keyspace":
+                # Live counts include ranges still in progress
+                fraction = lambda: min(1.0, (start + counter.value - baseline) / total)
+            else:
+                fraction = lambda: offset / total
+            reporter = ProgressReporter(counter, self.attempts, fraction)
+            reporter.start()
+        
+        try:
+            while (next_start < total or pending) and not self.found:
+                if abort is not None and abort.is_set():
+                    break
+                while next_start < total and len(pending) < window:
+                    chunk_end = min(next_start + chunk_size, total)
+                    future = executor.submit(task, next_start, chunk_end)
+                    pending[future] = (next_start, chunk_end)
+                    next_start = chunk_end
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_start, chunk_end = pending.pop(future)
+                    hits, tried = future.result()
+                    self.attempts += tried
+                    completed[chunk_start] = chunk_end
+                    
+                    for digest, password in hits:
+                        self.record_result(digest, password)
+                
+                while offset in completed:
+                    offset = completed.pop(offset)
+                
+                if self.found:
+                    stop_event.set()
+                    break
+                
+                if on_progress:
+                    on_progress(offset)
+        finally:
+            if reporter:
+                reporter.stop()
+
+            # Interrupted or done: let running workers exit and drop queued ranges
+            if pending:
+                stop_event.set()
+                for future in pending:
+                    future.cancel()
+                if abort is not None and abort.is_set():
+                    wait(pending)  # nothing may still be running when stop_event is cleared
+        
+        return offset
+    
+    def train_markov(self, source):
+        """Train a MarkovModel from a wordlist path, or 'builtin' for the built-in dictionary"""
+        if source == 'builtin':
+            model = MarkovModel(self.extended_dict)
+        else:
+            words = (word.decode('utf-8', errors='ignore') for word in read_wordlist(source))
+            model = MarkovModel(words, source=source)
+        print(f"🎲 Markov model trained on {model.words:,} words from {model.source}")
+        return model
     
-    def brute_force_attack(self):
-        """Try brute force attack"""
+    def brute_force_attack(self, markov=None):
+        """Try brute force attack using a pool of worker processes"""
         print(f"🔨 Starting brute force attack (max length: {self.max_length})...")
         print("⚠️  This may take a very long time for longer passwords!")
+        if markov:
+            print("🎲 Trying the most likely candidates first (Markov order)")
         
         start_time = time.time()
+        stop_event = multiprocessing.Event()
         
-        for length in range(1, self.max_length + 1):
-            if self.found:
-                break
+        with self.create_pool(stop_event) as executor:
+            for length in range(1, self.max_length + 1):
+                if self.found:
+                    break
+                    
+                print(f"\n🔍 Trying length {length}...")
+                length_start = time.time()
                 
-            print(f"\n🔍 Trying length {length}...")
-            length_start = time.time()
-            
-            # Estimate combinations
-            charset_size = len(string.ascii_lowercase + string.digits)
-            if length > 4:
-                charset_size = len(string.ascii_lowercase + string.digits + 
-                                string.ascii_uppercase + "!@#$")
-            
-            total_combinations = charset_size ** length
-            print(f"   Total combinations: {total_combinations:,}")
-            
-            if total_combinations > 10_000_000:
-                response = input(f"   This will try {total_combinations:,} combinations. Continue? (y/n): ")
-                if response.lower() != 'y':
-                    print("   Skipping this length...")
-                    continue
-            
-            # Generate passwords and split into chunks for threading
-            chunk_size = max(1000, total_combinations // (self.threads * 10))
-            
-            with ThreadPoolExecutor(max_workers=self.threads) as executor:
-                futures = []
-                current_chunk = []
+                charset = self.charset_for_length(length)
+                total_combinations = len(charset) ** length
+                print(f"   Charset: {len(charset)} characters")
+                print(f"   Total combinations: {total_combinations:,}")
                 
-                for password in self.generate_passwords(length):
-                    if self.found:
-                        break
-                    
-                    current_chunk.append(password)
-                    
-                    if len(current_chunk) >= chunk_size:
-                        future = executor.submit(self.brute_force_worker, current_chunk.copy())
-                        futures.append(future)
-                        current_chunk = []
+                if total_combinations > 10_000_000:
+                    response = input(f"   This will try {total_combinations:,} combinations. Continue? (y/n): ")
+                    if response.lower() != 'y':
+                        print("   Skipping this length...")
+                        continue
                 
-                # Submit remaining passwords
-                if current_chunk and not self.found:
-                    future = executor.submit(self.brute_force_worker, current_chunk)
-                    futures.append(future)
+                # Each worker gets an index range of the keyspace, not a list of passwords
+                self.run_keyspace(executor, stop_event, [charset] * length, markov=markov)
                 
-                # Check results
-                for future in as_completed(futures):
-                    result = future.result()
-                    if result:
-                        elapsed = time.time() - start_time
-                        print(f"✅ Password found: '{result}'")
-                        print(f"⏰ Time: {elapsed:.2f} seconds")
-                        print(f"🔢 Total attempts: {self.attempts:,}")
-                        return True
-            
-            length_elapsed = time.time() - length_start
-            print(f"   Length {length} completed in {length_elapsed:.2f} seconds")
+                if self.found:
+                    elapsed = time.time() - start_time
+                    print(f"⏰ Time: {elapsed:.2f} seconds")
+                    print(f"🔢 Total attempts: {self.attempts:,}")
+                    return True
+                
+                length_elapsed = time.time() - length_start
+                print(f"   Length {length} completed in {length_elapsed:.2f} seconds")
         
         elapsed = time.time() - start_time
+        if self.multi_target and len(self.remaining) < len(self.targets):
+            print(f"📊 Brute force cracked {len(self.targets) - len(self.remaining):,} of "
+                  f"{len(self.targets):,} hashes in {elapsed:.2f} seconds")
+            print(f"🔢 Total attempts: {self.attempts:,}")
+            return True
+        
         print(f"❌ Brute force attack failed after {elapsed:.2f} seconds")
         print(f"🔢 Total attempts: {self.attempts:,}")
         return False
     
-    def crack(self, use_dictionary=True, use_brute_force=False):
+    def targets_fingerprint(self):
+        """Short fingerprint of the target set, used to match checkpoints"""
+        return hashlib.sha256(b''.join(sorted(self.targets))).hexdigest()[:16]
+    
+    def load_checkpoint(self, checkpoint_file, mask, charsets, order='lexicographic'):
+        """Return the keyspace offset to resume from (0 if no matching checkpoint)"""
+        if not checkpoint_file or not os.path.exists(checkpoint_file):
+            return 0
+        
+        try:
+            with open(checkpoint_file, 'r') as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"⚠️  Ignoring unreadable checkpoint {checkpoint_file}: {e}")
+            return 0
+        
+        if (state.get('mask') != mask or state.get('charsets') != charsets or
+                state.get('order', 'lexicographic') != order or
+                state.get('hash_type') != self.hash_type or
+                state.get('targets') != self.targets_fingerprint()):
+            print(f"⚠️  Checkpoint {checkpoint_file} is for a different job - starting fresh")
+            return 0
+        
+        for hex_digest, password in state.get('results', {}).items():
+            self.record_result(bytes.fromhex(hex_digest), password)
+        self.attempts += state['offset']
+        return state['offset']
+    
+    def save_checkpoint(self, checkpoint_file, mask, charsets, offset, order='lexicographic'):
+        """Atomically write the current keyspace offset and results to disk"""
+        state = {
+            'mask': mask,
+            'charsets': charsets,
+            'order': order,
+            'hash_type': self.hash_type,
+            'targets': self.targets_fingerprint(),
+            'offset': offset,
+            'results': self.results,
+            'updated': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        temp_file = checkpoint_file + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_file, checkpoint_file)
+    
+    def mask_attack(self, mask, custom_charsets=None, checkpoint_file=None, markov=None):
+        """Try every candidate matching a hashcat-style mask such as ?u?l?l?l?d?d"""
+        charsets = parse_mask(mask, custom_charsets)
+        total = keyspace_size(charsets)
+        # Offsets only mean something for the order they were recorded in
+        order = f"markov:{markov.source}" if markov else 'lexicographic'
+        
+        print(f"🎭 Starting mask attack: {mask}")
+        print(f"   Keyspace: {total:,} candidates ({len(charsets)} positions)")
+        if markov:
+            print("   Order: most likely candidates first (Markov)")
+        
+        start_time = time.time()
+        start = self.load_checkpoint(checkpoint_file, mask, charsets, order)
+        if start:
+            print(f"   Resuming from checkpoint at offset {start:,} ({start / total * 100:.1f}%)")
+        
+        if self.found:
+            print("✅ All targets were already cracked in the checkpoint")
+            return True
+        
+        progress = {'offset': start, 'saved_at': time.time()}
+        
+        def save_progress(offset):
+            progress['offset'] = offset
+            if checkpoint_file and time.time() - progress['saved_at'] >= CHECKPOINT_INTERVAL:
+                self.save_checkpoint(checkpoint_file, mask, charsets, offset, order)
+                progress['saved_at'] = time.time()
+        
+        stop_event = multiprocessing.Event()
+        
+        try:
+            with self.create_pool(stop_event) as executor:
+                progress['offset'] = self.run_keyspace(executor, stop_event, charsets, start,
+                                                       on_progress=save_progress, markov=markov)
+        finally:
+            # Always leave an up-to-date checkpoint behind an unfinished job
+            offset = progress['offset']
+            if checkpoint_file and not self.found and offset < total:
+                self.save_checkpoint(checkpoint_file, mask, charsets, offset, order)
+                print(f"\n💾 Checkpoint saved to {checkpoint_file} at offset {offset:,} "
+                      f"- rerun the same command to resume")
+        
+        # Job finished one way or another: the checkpoint is no longer needed
+        if checkpoint_file and os.path.exists(checkpoint_file) and (self.found or offset >= total):
+            os.remove(checkpoint_file)
+        
+        elapsed = time.time() - start_time
+        if self.found:
+            print(f"⏰ Time: {elapsed:.2f} seconds")
+            print(f"🔢 Total attempts: {self.attempts:,}")
+            return True
+        
+        print(f"❌ Mask attack finished after {elapsed:.2f} seconds")
+        print(f"🔢 Total attempts: {self.attempts:,}")
+        return False
+    
+    def crack(self, use_dictionary=True, use_brute_force=False, mask=None,
+              custom_charsets=None, checkpoint_file=None, wordlist=None, rules=None,
+              tables=None, markov=None):
         """Main cracking function"""
         print(f"🔐 Hash Cracker - Educational Tool")
-        print(f"🎯 Target hash: {self.hash_value}")
+        if self.multi_target:
+            print(f"🎯 Target hashes: {len(self.targets):,}")
+        else:
+            print(f"🎯 Target hash: {self.hash_value or next(iter(self.targets)).hex()}")
         print(f"🔍 Hash type: {self.hash_type.upper()}")
-        print(f"⚡ Threads: {self.threads}")
+        print(f"⚡ Workers: {self.workers}")
         print("=" * 60)
         
         start_time = time.time()
         
-        # Try dictionary attack first
+        # Hashes cracked in earlier runs need no work at all
+        if self.potfile is not None and self.potfile_lookup():
+            return self.result
+        
+        # Precomputed tables answer instantly, so they go first
+        if tables and not self.found:
+            if self.table_lookup(tables):
+                return self.result
+            print()
+        
+        # Try dictionary attack
         if use_dictionary and not self.found:
-            if self.dictionary_attack():
+            if self.dictionary_attack(wordlist, rules):
+                return self.result
+        
+        # Try the mask next - it is much smaller than a full brute force
+        if mask and not self.found:
+            print(f"\n{'='*60}")
+            if self.mask_attack(mask, custom_charsets, checkpoint_file, markov):
                 return self.result
         
         # Try brute force if dictionary failed
         if use_brute_force and not self.found:
             print(f"\n{'='*60}")
-            if self.brute_force_attack():
+            if self.brute_force_attack(markov):
                 return self.result
         
         total_time = time.time() - start_time
         print(f"\n{'='*60}")
+        if self.multi_target and self.results:
+            print(f"📊 Cracked {len(self.results):,} of {len(self.targets):,} hashes")
+            print(f"⏰ Total time: {total_time:.2f} seconds")
+            print(f"🔢 Total attempts: {self.attempts:,}")
+            return self.result
+        
         print(f"❌ Hash could not be cracked")
         print(f"⏰ Total time: {total_time:.2f} seconds")
         print(f"🔢 Total attempts: {self.attempts:,}")
@@ -258,7 +1594,566 @@ class HashCracker:
         
         return None
 
+class SaltedHashCracker(HashCracker):
+    """
+    Dictionary attack against salted PBKDF2 hashes (SecureUserAuth and
+    SecureBankDatabase stores). Every user has their own salt, so each guess
+    must be computed separately per user - the attack cost the KDF imposes
+    is measured and reported.
+    """
+    
+    def __init__(self, salted_file, algorithm="sha256", iterations=PBKDF2_DEFAULT_ITERATIONS,
+                 workers=None):
+        self.salted_file = salted_file
+        self.algorithm = algorithm
+        self.iterations = iterations
+        self.workers = workers or os.cpu_count() or 1
+        self.users = load_salted_hashes(salted_file)
+        self.results = {}  # username -> password
+        self.attempts = 0
+        
+        if not self.users:
+            raise ValueError(f"No users found in {salted_file}")
+        
+        self.build_dictionary()
+    
+    def measure_costs(self):
+        """Time one KDF evaluation and one plain hash on this machine (seconds each)"""
+        samples = 3
+        start = time.perf_counter()
+        for _ in range(samples):
+            hashlib.pbkdf2_hmac(self.algorithm, b'benchmark', b'salt', self.iterations)
+        kdf_seconds = (time.perf_counter() - start) / samples
+        
+        plain_func = getattr(hashlib, self.algorithm)
+        samples = 100_000
+        start = time.perf_counter()
+        for _ in range(samples):
+            plain_func(b'benchmark').digest()
+        plain_seconds = (time.perf_counter() - start) / samples
+        
+        return kdf_seconds, plain_seconds
+    
+    def candidates(self, wordlist=None, rules=None):
+        """Candidate passwords as bytes: a wordlist or the built-in dictionary"""
+        words = (read_wordlist(wordlist) if wordlist
+                 else (word.encode() for word in self.extended_dict))
+        if rules:
+            words = apply_rules(words, [parse_rule(rule) for rule in rules])
+        return words
+    
+    def crack(self, wordlist=None, rules=None):
+        """Attack every user's salt/hash pair, spreading KDF work over a process pool"""
+        print(f"🧂 Salted Hash Cracker - Educational Tool")
+        print(f"🎯 Targets: {len(self.users)} users from {self.salted_file}")
+        print(f"🔍 Hash type: PBKDF2-{self.algorithm.upper()} ({self.iterations:,} iterations)")
+        print(f"⚡ Workers: {self.workers}")
+        print("=" * 60)
+        
+        kdf_seconds, plain_seconds = self.measure_costs()
+        batch_size = max(1, int(PBKDF2_BATCH_SECONDS / kdf_seconds))
+        print(f"⏱️  One PBKDF2 guess: {kdf_seconds * 1000:.1f} ms, "
+              f"one plain {self.algorithm.upper()} guess: {plain_seconds * 1e6:.2f} µs")
+        print(f"   → every guess is {kdf_seconds / plain_seconds:,.0f}x more expensive")
+        print(f"   Work units: {batch_size} guesses (~{PBKDF2_BATCH_SECONDS:.0f}s each)\n")
+        
+        start_time = time.time()
+        window = self.workers * 2
+        pending = {}  # future -> username
+        
+        def collect(done):
+            for future in done:
+                username = pending.pop(future)
+                if future.cancelled():
+                    continue
+                password, tried = future.result()
+                self.attempts += tried
+                if password is not None and username not in self.results:
+                    self.results[username] = password
+                    print(f"✅ {username}: '{display_password(password)}' "
+                          f"(after {time.time() - start_time:.1f} seconds)", flush=True)
+        
+        candidates = self.candidates(wordlist, rules)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while len(self.results) < len(self.users):
+                    batch = list(itertools.islice(candidates, batch_size))
+                    if not batch:
+                        break
+                    
+                    # Salts differ, so the same guess is recomputed for every user
+                    for username, salt, expected in self.users:
+                        if username in self.results:
+                            continue
+                        while len(pending) >= window:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(done)
+                        future = executor.submit(pbkdf2_batch, self.algorithm, self.iterations,
+                                                 salt, expected, batch)
+                        pending[future] = username
+                
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            finally:
+                for future in pending:
+                    future.cancel()
+        
+        self.print_report(time.time() - start_time, kdf_seconds, plain_seconds)
+        return self.results
+    
+    def print_report(self, elapsed, kdf_seconds, plain_seconds):
+        """Summarize what the KDF cost meant for this attack"""
+        rate = self.attempts / elapsed if elapsed > 0 else 0
+        print(f"\n{'='*60}")
+        print(f"📊 Cracked {len(self.results)} of {len(self.users)} users")
+        print(f"⏰ Total time: {elapsed:.2f} seconds")
+        print(f"🔢 Total guesses: {self.attempts:,}")
+        print(f"⚡ Measured throughput: {rate:,.1f} guesses/second with {self.workers} workers")
+        
+        if rate:
+            plain_rate = self.workers / plain_seconds
+            print("\n💡 What the key derivation function costs an attacker:")
+            print(f"   • 1,000,000 guesses per user: {1_000_000 / rate / 3600:,.1f} hours "
+                  f"(unsalted {self.algorithm.upper()}: {1_000_000 / plain_rate:.2f} seconds)")
+            print(f"   • Unique salts mean every user has to be attacked separately")
+            print(f"   • Doubling the iteration count doubles the attacker's time")
+
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+    """One worker connection: newline-delimited JSON requests, one reply each"""
+    
+    def handle(self):
+        coordinator = self.server.coordinator
+        worker = f"{self.client_address[0]}:{self.client_address[1]}"
+        with coordinator.lease_lock:
+            coordinator.connections += 1
+        try:
+            for line in self.rfile:
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                try:
+                    if not isinstance(message, dict):
+                        raise ValueError("message is not a JSON object")
+                    if message.get('op') == 'hello' and message.get('name'):
+                        worker = f"{message['name']}@{self.client_address[0]}"
+                    reply = coordinator.handle_message(message, worker)
+                except (ValueError, TypeError, KeyError, AttributeError) as e:
+                    print(f"⚠️  Malformed message from {worker}: {e!r}", flush=True)
+                    reply = {'op': 'error', 'error': str(e), 'stop': coordinator.finished.is_set()}
+                self.wfile.write(json.dumps(reply).encode() + b'\n')
+                self.wfile.flush()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            coordinator.release_worker(worker)
+
+
+class DistributedCoordinator(HashCracker):
+    """
+    Shares a brute force / mask keyspace between worker machines.
+    The keyspaces are numbered as one global index range that is handed
+    out in leases; workers heartbeat while they work, and a lease whose
+    worker disconnects or goes quiet for lease_timeout seconds is queued
+    again for someone else. Every reply carries a stop flag, so once all
+    targets are cracked each worker hears about it within one heartbeat.
+    """
+    
+    def serve(self, host, port, keyspaces, lease_size=None, lease_timeout=DISTRIBUTED_LEASE_TIMEOUT):
+        """Run the coordinator until every target is cracked or the keyspace is exhausted"""
+        self.keyspaces = keyspaces
+        self.total = sum(keyspace_size(charsets) for charsets in keyspaces)
+        self.lease_size = lease_size or min(DISTRIBUTED_LEASE_SIZE, max(100_000, self.total // 256))
+        self.lease_timeout = lease_timeout
+        self.lease_lock = threading.Lock()
+        self.lease_ids = itertools.count(1)
+        self.leases = {}  # lease id -> {'start', 'stop', 'worker', 'expires'}
+        self.requeued = collections.deque()  # (start, stop) of lost leases
+        self.next_offset = 0
+        self.completed = 0
+        self.reassigned = 0
+        self.workers_seen = set()
+        self.connections = 0
+        self.finished = threading.Event()
+        
+        print(f"📡 Distributed keyspace: {self.total:,} candidates in leases of {self.lease_size:,}")
+        
+        server = socketserver.ThreadingTCPServer((host, port), CoordinatorHandler)
+        server.daemon_threads = True
+        server.coordinator = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        bound_host, bound_port = server.server_address[:2]
+        print(f"📡 Coordinator listening on {bound_host}:{bound_port}")
+        print(f"   Start workers with: python hash_cracker.py --worker {bound_host}:{bound_port}")
+        
+        start_time = time.time()
+        try:
+            while not self.finished.wait(DISTRIBUTED_HEARTBEAT):
+                with self.lease_lock:
+                    self.expire_leases()
+                    done = self.completed / self.total if self.total else 1
+                    elapsed = time.time() - start_time
+                    rate = self.attempts / elapsed if elapsed > 0 else 0
+                    print(f"   Progress: {done * 100:.1f}% | {rate:,.0f}/s | "
+                          f"workers: {len(self.workers_seen)} | leases out: {len(self.leases)} | "
+                          f"cracked: {len(self.results)}/{len(self.targets)}", flush=True)
+        finally:
+            self.finished.set()
+            # Let connected workers pick up the stop flag on their next request
+            deadline = time.time() + 2 * DISTRIBUTED_HEARTBEAT
+            while self.connections and time.time() < deadline:
+                time.sleep(0.1)
+            server.shutdown()
+            server.server_close()
+        
+        return self.found
+    
+    def verified_hits(self, hits, worker):
+        """
+        The [hex digest, password] pairs a worker reported whose password
+        really hashes to the digest; anything else is dropped. Raises
+        ValueError / TypeError on a malformed list.
+        """
+        if not isinstance(hits, list):
+            raise TypeError("hits must be a list")
+        verified = []
+        for hex_digest, password in hits:
+            if not isinstance(hex_digest, str) or not isinstance(password, str):
+                raise TypeError("a hit is [hex digest, password]")
+            digest = bytes.fromhex(hex_digest)
+            if self.hash_func(candidate_bytes(password)).digest() == digest:
+                verified.append((digest, password))
+            else:
+                print(f"⚠️  Dropping bogus hit from {worker}: "
+                      f"'{display_password(password)}' does not hash to {hex_digest}", flush=True)
+        return verified
+    
+    def handle_message(self, message, worker):
+        """Apply one worker request and build the reply (ValueError etc. if malformed)"""
+        op = message.get('op')
+        tried = message.get('tried', 0)
+        if not isinstance(tried, int) or tried < 0:
+            raise ValueError(f"bad attempt count: {tried!r}")
+        hits = self.verified_hits(message.get('hits', []), worker)
+        
+        with self.lease_lock:
+            for digest, password in hits:
+                self.record_result(digest, password)
+            self.attempts += tried
+            
+            reply = {'op': 'ok'}
+            if op == 'hello':
+                self.workers_seen.add(worker)
+                print(f"👋 Worker joined: {worker}", flush=True)
+                reply = {'op': 'job', 'hash_type': self.hash_type, 'keyspaces': self.keyspaces,
+                         'targets': [digest.hex() for digest in self.remaining],
+                         'heartbeat': min(DISTRIBUTED_HEARTBEAT, self.lease_timeout / 3)}
+            elif op == 'heartbeat':
+                lease = self.leases.get(message.get('lease'))
+                if lease and lease['worker'] == worker:
+                    lease['expires'] = time.monotonic() + self.lease_timeout
+                else:
+                    reply['lease_lost'] = True
+            elif op == 'complete':
+                lease = self.leases.get(message.get('lease'))
+                if lease and lease['worker'] == worker:
+                    del self.leases[message['lease']]
+                    self.completed += lease['stop'] - lease['start']
+            elif op == 'lease' and not self.found:
+                reply = self.grant_lease(worker)
+            
+            if self.found or self.completed >= self.total:
+                self.finished.set()
+            reply['stop'] = self.finished.is_set()
+            return reply
+    
+    def grant_lease(self, worker):
+        """Next range for a worker: lost work first, then fresh keyspace (lease_lock held)"""
+        self.expire_leases()
+        if self.requeued:
+            start, stop = self.requeued.popleft()
+        elif self.next_offset < self.total:
+            start = self.next_offset
+            stop = self.next_offset = min(start + self.lease_size, self.total)
+        else:
+            # Everything is leased out - ask again in case a lease is lost
+            return {'op': 'wait', 'seconds': 1}
+        
+        lease_id = next(self.lease_ids)
+        self.leases[lease_id] = {'start': start, 'stop': stop, 'worker': worker,
+                                 'expires': time.monotonic() + self.lease_timeout}
+        return {'op': 'range', 'lease': lease_id, 'start': start, 'end': stop}
+    
+    def expire_leases(self):
+        """Queue the ranges of leases whose worker went quiet (lease_lock held)"""
+        now = time.monotonic()
+        for lease_id, lease in list(self.leases.items()):
+            if lease['expires'] < now:
+                self.requeue(lease_id, f"timed out on {lease['worker']}")
+    
+    def release_worker(self, worker):
+        """A worker disconnected: its unfinished leases go back in the queue"""
+        with self.lease_lock:
+            self.connections -= 1
+            for lease_id, lease in list(self.leases.items()):
+                if lease['worker'] == worker:
+                    self.requeue(lease_id, f"lost with {worker}")
+    
+    def requeue(self, lease_id, reason):
+        lease = self.leases.pop(lease_id)
+        self.requeued.append((lease['start'], lease['stop']))
+        if not self.finished.is_set():
+            self.reassigned += 1
+            print(f"♻️  Lease {lease_id} [{lease['start']:,}-{lease['stop']:,}) {reason} "
+                  f"- reassigning", flush=True)
+    
+    def crack_distributed(self, host, port, mask=None, custom_charsets=None, lease_size=None,
+                          lease_timeout=DISTRIBUTED_LEASE_TIMEOUT):
+        """Coordinate a mask (or brute force up to max_length) attack across workers"""
+        print(f"🔐 Hash Cracker - Distributed Coordinator")
+        print(f"🎯 Target hashes: {len(self.targets):,}")
+        print(f"🔍 Hash type: {self.hash_type.upper()}")
+        print("=" * 60)
+        
+        if self.potfile is not None and self.potfile_lookup():
+            return self.result
+        
+        if mask:
+            keyspaces = [parse_mask(mask, custom_charsets)]
+            print(f"🎭 Mask: {mask}")
+        else:
+            keyspaces = [[self.charset_for_length(length)] * length
+                         for length in range(1, self.max_length + 1)]
+            print(f"🔨 Brute force, lengths 1-{self.max_length}")
+        
+        start_time = time.time()
+        try:
+            self.serve(host, port, keyspaces, lease_size, lease_timeout)
+        finally:
+            elapsed = time.time() - start_time
+            print(f"\n{'='*60}")
+            print(f"📊 Cracked {len(self.results):,} of {len(self.targets):,} hashes")
+            print(f"⏰ Time: {elapsed:.2f} seconds")
+            print(f"🔢 Total attempts: {self.attempts:,} from {len(self.workers_seen)} workers")
+            if self.reassigned:
+                print(f"♻️  Leases reassigned: {self.reassigned}")
+        return self.result if self.results else None
+
+
+class DistributedWorker(HashCracker):
+    """
+    Worker mode: fetch the job from a coordinator, then lease keyspace
+    ranges and search them with the local process pool until told to stop.
+    A background thread heartbeats the current lease and reports hits.
+    """
+    
+    def __init__(self, host, port, workers=None):
+        self.address = (host, port)
+        self.connection = socket.create_connection(self.address, timeout=DISTRIBUTED_LEASE_TIMEOUT)
+        self.stream = self.connection.makefile('rwb')
+        self.io_lock = threading.Lock()
+        self.unreported = []  # [hex digest, password] not yet sent to the coordinator
+        self.reported_attempts = 0
+        self.lease_id = None
+        self.lease_lost = threading.Event()  # the coordinator took the current lease back
+        self.stop_event = None
+        self.attempts = 0
+        
+        job = self.request({'op': 'hello', 'name': f"{platform.node()}/{os.getpid()}"})
+        if job['stop'] or not job.get('targets'):
+            self.connection.close()
+            raise ValueError("the coordinator has no work left")
+        super().__init__(hash_type=job['hash_type'], workers=workers, targets=job['targets'])
+        self.keyspaces = job['keyspaces']
+        self.heartbeat_interval = job['heartbeat']
+        self.verbose = False  # the coordinator reports overall progress
+    
+    def request(self, message):
+        """Send one message (plus any unreported hits and attempts) and read the reply"""
+        with self.io_lock:
+            message['hits'], self.unreported = self.unreported, []
+            message['tried'] = self.attempts - self.reported_attempts
+            self.reported_attempts = self.attempts
+            self.stream.write(json.dumps(message).encode() + b'\n')
+            self.stream.flush()
+            line = self.stream.readline()
+        if not line:
+            raise ConnectionError("coordinator closed the connection")
+        return json.loads(line)
+    
+    def record_result(self, digest, password):
+        if not super().record_result(digest, password):
+            return False
+        with self.io_lock:
+            self.unreported.append([digest.hex(), password])
+        return True
+    
+    def halt(self):
+        """Stop the local search (run_ranges exits once found is set)"""
+        self.found = True
+        if self.stop_event:
+            self.stop_event.set()
+    
+    def heartbeat(self, done):
+        while not done.wait(self.heartbeat_interval):
+            lease_id = self.lease_id
+            if lease_id is None:
+                continue
+            try:
+                reply = self.request({'op': 'heartbeat', 'lease': lease_id})
+            except (ConnectionError, OSError):
+                print("⚠️  Lost connection to the coordinator - stopping", flush=True)
+                self.halt()
+                return
+            if reply['stop']:
+                print("🛑 Coordinator says stop", flush=True)
+                self.halt()
+                return
+            if reply.get('lease_lost') and self.lease_id == lease_id:
+                # Expired while we were busy and handed to another worker
+                print(f"♻️  Lease {lease_id} was reassigned - dropping it", flush=True)
+                self.lease_lost.set()
+    
+    def lease_ranges(self, start, stop):
+        """Split a global lease into (charsets, local start, local stop) per keyspace"""
+        base = 0
+        for charsets in self.keyspaces:
+            size = keyspace_size(charsets)
+            low, high = max(start, base), min(stop, base + size)
+            if low < high:
+                yield charsets, low - base, high - base
+            base += size
+    
+    def run(self):
+        """Work through leases until the coordinator says stop"""
+        print(f"🛰️  Worker connected to {self.address[0]}:{self.address[1]} "
+              f"({len(self.targets):,} targets, {self.workers} processes)")
+        start_time = time.time()
+        leases = 0
+        done = threading.Event()
+        self.stop_event = multiprocessing.Event()
+        threading.Thread(target=self.heartbeat, args=(done,), daemon=True).start()
+        
+        try:
+            with self.create_pool(self.stop_event) as executor:
+                while not self.found:
+                    reply = self.request({'op': 'lease'})
+                    if reply['stop']:
+                        break
+                    if reply['op'] == 'wait':
+                        time.sleep(reply['seconds'])
+                        continue
+                    
+                    self.lease_id = reply['lease']
+                    lease_start = time.time()
+                    tried_before = self.attempts
+                    for charsets, low, high in self.lease_ranges(reply['start'], reply['end']):
+                        chunk_size = min(MAX_CHUNK_SIZE, max(10_000, (high - low) // (self.workers * 4)))
+                        task = functools.partial(brute_force_range, self.hash_type, charsets)
+                        self.run_ranges(executor, self.stop_event, task, low, high, chunk_size,
+                                        abort=self.lease_lost)
+                        if self.found or self.lease_lost.is_set():
+                            break
+                    if self.found:
+                        break
+                    if self.lease_lost.is_set():
+                        # Someone else owns the range now: no 'complete', just the next lease
+                        self.lease_id = None
+                        self.lease_lost.clear()
+                        self.stop_event.clear()
+                        continue
+                    
+                    leases += 1
+                    elapsed = time.time() - lease_start
+                    rate = (self.attempts - tried_before) / elapsed if elapsed > 0 else 0
+                    print(f"   Lease {self.lease_id} [{reply['start']:,}-{reply['end']:,}) "
+                          f"done at {rate:,.0f}/s", flush=True)
+                    self.lease_id = None
+                    if self.request({'op': 'complete', 'lease': reply['lease']})['stop']:
+                        break
+        except (ConnectionError, OSError) as e:
+            print(f"⚠️  Coordinator unreachable: {e}")
+        finally:
+            done.set()
+            try:
+                self.request({'op': 'bye'})  # flush the last hits and attempts
+            except (ConnectionError, OSError):
+                pass
+            self.connection.close()
+        
+        elapsed = time.time() - start_time
+        print(f"🏁 Worker finished: {leases} leases, {self.attempts:,} attempts "
+              f"in {elapsed:.2f} seconds, {len(self.results)} hits")
+        return self.results
+
+
+def build_table_main(argv):
+    """'build-table' subcommand: precompute a lookup table file"""
+    parser = argparse.ArgumentParser(
+        prog="hash_cracker.py build-table",
+        description="Precompute a sorted lookup table for instant hash reversal",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Every 4-6 character lowercase+digit password, MD5
+  python hash_cracker.py build-table md5_ld4-6.table -1 ?l?d --mask ?1?1?1?1 --mask ?1?1?1?1?1 --mask ?1?1?1?1?1?1
+  
+  # Every word in a wordlist, SHA1
+  python hash_cracker.py build-table sha1_common.table --type sha1 --wordlist common.txt
+  
+  # Then crack with it
+  python hash_cracker.py hash_here --table md5_ld4-6.table
+        """
+    )
+    parser.add_argument("output", help="Table file to write")
+    parser.add_argument("--type", "-t", default="md5",
+                       choices=["md5", "sha1", "sha256", "sha512"],
+                       help="Hash algorithm (default: md5)")
+    parser.add_argument("--mask", "-m", action="append",
+                       help="Mask to precompute (repeat for several lengths)")
+    for number in range(1, 5):
+        parser.add_argument(f"-{number}", f"--custom-charset{number}", dest=f"charset{number}",
+                           help=f"Custom charset for ?{number} in the masks")
+    parser.add_argument("--wordlist", "-W", help="Wordlist to precompute instead of masks")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count(),
+                       help="Number of worker processes (default: CPU count)")
+    
+    args = parser.parse_args(argv)
+    
+    if bool(args.mask) == bool(args.wordlist):
+        print("❌ Provide either --mask (one or more) or --wordlist")
+        return
+    
+    custom_charsets = {str(number): getattr(args, f"charset{number}")
+                       for number in range(1, 5) if getattr(args, f"charset{number}")}
+    
+    try:
+        if args.mask:
+            total = sum(keyspace_size(parse_mask(mask, custom_charsets)) for mask in args.mask)
+            print(f"📦 Building {args.type.upper()} table for {total:,} candidates "
+                  f"(~{total * TABLE_RECORD_SIZE / 1e9:.2f} GB)")
+        else:
+            print(f"📦 Building {args.type.upper()} table for wordlist {args.wordlist}")
+        
+        start_time = time.time()
+        count = build_lookup_table(args.output, args.type, masks=args.mask,
+                                   custom_charsets=custom_charsets,
+                                   wordlist=args.wordlist, workers=args.workers)
+        print(f"✅ Wrote {count:,} entries to {args.output} "
+              f"in {time.time() - start_time:.2f} seconds")
+    except KeyboardInterrupt:
+        print("\n\n🛑 Table build interrupted by user")
+    except (ValueError, IOError) as e:
+        print(f"❌ Error: {e}")
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "build-table":
+        build_table_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
         description="Educational Hash Cracker - Learn about hash security",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -271,76 +2166,265 @@ Examples:
   python hash_cracker.py aaf4c61ddcc5e8a2dabede0f3b482cd9aea9434d --type sha1 --brute-force
   
   # Longer max length
-  python hash_cracker.py hash_here --max-length 8 --threads 8
+  python hash_cracker.py hash_here --max-length 8 --workers 8
+  
+  # External wordlist with the built-in mangling rules (streamed, constant memory)
+  python hash_cracker.py hash_here --wordlist rockyou.txt --rules default
+  
+  # Mask attack: capital letter, 3 lowercase, 2 digits (resumable)
+  python hash_cracker.py hash_here --mask "?u?l?l?l?d?d"
+  
+  # Try likely candidates first, ordered by a Markov model of a wordlist
+  python hash_cracker.py hash_here --mask "?l?l?l?l?d" --markov rockyou.txt
+  
+  # Custom charset per position: ?1 = vowels
+  python hash_cracker.py hash_here --mask "?l?1?l?1?d" -1 aeiou
+  
+  # Precompute a lookup table once, then reverse hashes instantly
+  python hash_cracker.py build-table md5_ld4.table -1 ?l?d --mask ?1?1?1?1
+  python hash_cracker.py hash_here --table md5_ld4.table
+  
+  # Attack the salted PBKDF2 hashes stored by the demo auth systems
+  python hash_cracker.py --salted ../timing_attack_demo/users.json
+  python hash_cracker.py --salted securebank.db --wordlist common.txt
+  
+  # Measure candidates/second for every algorithm at 1..8 workers
+  python hash_cracker.py --benchmark --workers 8
+  
+  # Hits are remembered in hash_cracker.pot; use another potfile or none
+  python hash_cracker.py hash_here --potfile class.pot
+  python hash_cracker.py hash_here --no-potfile
+  
+  # Share a long mask between lab machines: one coordinator, any number of workers
+  python hash_cracker.py hash_here --mask "?l?l?l?l?l?l?d" --coordinator 0.0.0.0:47800
+  python hash_cracker.py --worker 192.168.1.10:47800
+  
+  # Crack a whole file of hashes in one pass
+  python hash_cracker.py --hash-file hashes.txt --type sha1 --brute-force
 
 ⚠️  Educational purposes only! Only crack hashes you own or have permission to crack.
         """
     )
     
-    parser.add_argument("hash", help="Hash to crack (hex format)")
+    parser.add_argument("hash", nargs="?", help="Hash to crack (hex format)")
+    parser.add_argument("--hash-file", "-f",
+                       help="File of target hashes, one per line (multi-target mode)")
     parser.add_argument("--type", "-t", default="md5", 
                        choices=["md5", "sha1", "sha256", "sha512"],
                        help="Hash algorithm (default: md5)")
     parser.add_argument("--max-length", "-l", type=int, default=6,
                        help="Maximum password length for brute force (default: 6)")
-    parser.add_argument("--threads", type=int, default=4,
-                       help="Number of threads (default: 4)")
+    parser.add_argument("--workers", "-w", "--threads", dest="workers", type=int,
+                       default=os.cpu_count(),
+                       help="Number of brute force worker processes (default: CPU count)")
     parser.add_argument("--dictionary-only", "-d", action="store_true",
                        help="Use dictionary attack only")
     parser.add_argument("--brute-force", "-b", action="store_true",
                        help="Enable brute force attack")
+    parser.add_argument("--wordlist", "-W",
+                       help="Wordlist file for the dictionary attack (default: built-in list)")
+    parser.add_argument("--rules", "-r",
+                       help="Rule file (hashcat syntax, one rule per line) or 'default'")
+    parser.add_argument("--salted", "-S",
+                       help="Salted PBKDF2 store to attack: users.json or securebank.db")
+    parser.add_argument("--iterations", type=int, default=PBKDF2_DEFAULT_ITERATIONS,
+                       help=f"PBKDF2 iterations for --salted (default: {PBKDF2_DEFAULT_ITERATIONS:,})")
+    parser.add_argument("--benchmark", action="store_true",
+                       help="Measure hashes/second per algorithm at 1..--workers workers")
+    parser.add_argument("--benchmark-size", type=int, default=2_000_000,
+                       help="Candidates per benchmark run (default: 2,000,000)")
+    parser.add_argument("--benchmark-json", default="hash_cracker_benchmark.json",
+                       help="Benchmark JSON report (default: hash_cracker_benchmark.json)")
+    parser.add_argument("--table", "-T", action="append",
+                       help="Precomputed lookup table to check first (see build-table; repeatable)")
+    parser.add_argument("--mask", "-m",
+                       help="Mask attack, e.g. ?u?l?l?l?d?d (?l ?u ?d ?h ?H ?s ?a ?1-?4)")
+    for number in range(1, 5):
+        parser.add_argument(f"-{number}", f"--custom-charset{number}", dest=f"charset{number}",
+                           help=f"Custom charset for ?{number} in the mask (e.g. ?l?d or abc)")
+    parser.add_argument("--markov", nargs="?", const="builtin", metavar="WORDLIST",
+                       help="Brute force / mask in Markov order trained on WORDLIST "
+                            "(default: the built-in dictionary)")
+    parser.add_argument("--potfile", default="hash_cracker.pot",
+                       help="Cracked hashes from earlier runs (default: hash_cracker.pot)")
+    parser.add_argument("--no-potfile", action="store_true",
+                       help="Neither read nor update the potfile")
+    parser.add_argument("--coordinator", metavar="[HOST:]PORT",
+                       help="Hand the mask / brute force keyspace out to --worker processes")
+    parser.add_argument("--worker", metavar="HOST[:PORT]",
+                       help="Join a coordinator and search the ranges it leases out")
+    parser.add_argument("--lease-size", type=int,
+                       help="Candidates per distributed lease (default: sized to the keyspace)")
+    parser.add_argument("--lease-timeout", type=float, default=DISTRIBUTED_LEASE_TIMEOUT,
+                       help=f"Seconds without a heartbeat before a lease is reassigned "
+                            f"(default: {DISTRIBUTED_LEASE_TIMEOUT})")
+    parser.add_argument("--checkpoint", default="hash_cracker.checkpoint",
+                       help="Mask attack checkpoint file (default: hash_cracker.checkpoint)")
     
     args = parser.parse_args()
     
+    if args.benchmark:
+        try:
+            run_benchmark(args.workers, args.benchmark_size, json_path=args.benchmark_json)
+        except KeyboardInterrupt:
+            print("\n\n🛑 Benchmark interrupted by user")
+        return
+    
+    if args.worker:
+        host, _, port = args.worker.rpartition(':') if ':' in args.worker else (args.worker, '', '')
+        print("⚠️  EDUCATIONAL USE ONLY - only join coordinators you are authorized to work for")
+        try:
+            DistributedWorker(host, int(port or DISTRIBUTED_PORT), args.workers).run()
+        except KeyboardInterrupt:
+            print("\n\n🛑 Worker interrupted by user")
+        except (ValueError, OSError) as e:
+            print(f"❌ Worker error: {e}")
+        return
+    
+    if not args.hash and not args.hash_file and not args.salted:
+        print("❌ Please provide a hash or use --hash-file / --salted")
+        return
+    
     # Validate hash format
     expected_lengths = {"md5": 32, "sha1": 40, "sha256": 64, "sha512": 128}
-    if len(args.hash) != expected_lengths[args.type]:
+    if args.salted:
+        if not os.path.exists(args.salted):
+            print(f"❌ Salted hash store not found: {args.salted}")
+            return
+    elif args.hash_file:
+        if not os.path.exists(args.hash_file):
+            print(f"❌ Hash file not found: {args.hash_file}")
+            return
+    elif len(args.hash) != expected_lengths[args.type]:
         print(f"❌ Invalid hash length. {args.type.upper()} hashes should be {expected_lengths[args.type]} characters")
         return
     
-    if not all(c in string.hexdigits for c in args.hash):
+    elif not all(c in string.hexdigits for c in args.hash):
         print("❌ Hash should only contain hexadecimal characters")
         return
     
-    print("🔒 Educational Hash Cracker v1.0")
-    print("📚 Learn about password hashing and security\n")
+    custom_charsets = {str(number): getattr(args, f"charset{number}")
+                       for number in range(1, 5) if getattr(args, f"charset{number}")}
+    if args.mask:
+        try:
+            parse_mask(args.mask, custom_charsets)
+        except ValueError as e:
+            print(f"❌ Invalid mask: {e}")
+            return
     
-    # Security warning
-    print("⚠️  EDUCATIONAL USE ONLY")
-    print("   Only crack hashes from your own systems or with explicit permission!")
+    if args.wordlist and not os.path.exists(args.wordlist):
+        print(f"❌ Wordlist not found: {args.wordlist}")
+        return
     
-    if not args.dictionary_only:
-        response = input("\nContinue? (yes/no): ")
-        if response.lower() not in ['yes', 'y']:
-            print("🛑 Operation cancelled")
+    if args.markov and args.markov != 'builtin' and not os.path.exists(args.markov):
+        print(f"❌ Markov training wordlist not found: {args.markov}")
+        return
+    
+    rules = None
+    if args.rules:
+        try:
+            rules = load_rules(args.rules)
+        except (ValueError, IOError) as e:
+            print(f"❌ Invalid rules: {e}")
             return
     
+    tables = []
+    potfile = None
     try:
-        cracker = HashCracker(
-            hash_value=args.hash,
-            hash_type=args.type,
-            max_length=args.max_length,
-            threads=args.threads
-        )
-        
-        use_dictionary = not args.brute_force or not args.dictionary_only
-        use_brute_force = args.brute_force
+        for table_path in args.table or []:
+            try:
+                tables.append(LookupTable(table_path))
+            except (ValueError, IOError) as e:
+                print(f"❌ Cannot open table {table_path}: {e}")
+                return
         
-        if args.dictionary_only:
-            use_brute_force = False
+        print("🔒 Educational Hash Cracker v1.0")
+        print("📚 Learn about password hashing and security\n")
         
-        result = cracker.crack(
-            use_dictionary=use_dictionary,
-            use_brute_force=use_brute_force
-        )
+        # Security warning
+        print("⚠️  EDUCATIONAL USE ONLY")
+        print("   Only crack hashes from your own systems or with explicit permission!")
         
-        if result:
-            print(f"\n🎉 SUCCESS! Password: '{result}'")
+        if not args.dictionary_only:
+            response = input("\nContinue? (yes/no): ")
+            if response.lower() not in ['yes', 'y']:
+                print("🛑 Operation cancelled")
+                return
         
-    except KeyboardInterrupt:
-        print("\n\n🛑 Cracking interrupted by user")
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
+        try:
+            if args.salted:
+                cracker = SaltedHashCracker(args.salted, iterations=args.iterations,
+                                            workers=args.workers)
+                results = cracker.crack(wordlist=args.wordlist, rules=rules)
+                if results:
+                    print(f"\n🎉 SUCCESS! Cracked {len(results)} passwords")
+                return
+            
+            potfile = None if args.no_potfile else Potfile(args.potfile)
+            
+            if args.coordinator:
+                host, _, port = args.coordinator.rpartition(':')
+                coordinator = DistributedCoordinator(
+                    hash_value=args.hash,
+                    hash_type=args.type,
+                    max_length=args.max_length,
+                    hash_file=args.hash_file,
+                    potfile=potfile
+                )
+                coordinator.crack_distributed(host or '0.0.0.0', int(port or DISTRIBUTED_PORT),
+                                              args.mask, custom_charsets, args.lease_size,
+                                              args.lease_timeout)
+                if coordinator.results:
+                    print(f"\n🎉 SUCCESS! Cracked {len(coordinator.results):,} hashes")
+                return
+            
+            cracker = HashCracker(
+                hash_value=args.hash,
+                hash_type=args.type,
+                max_length=args.max_length,
+                workers=args.workers,
+                hash_file=args.hash_file,
+                potfile=potfile
+            )
+            
+            use_dictionary = not args.brute_force or not args.dictionary_only
+            use_brute_force = args.brute_force
+            
+            if args.dictionary_only:
+                use_brute_force = False
+            
+            markov = None
+            if args.markov and (use_brute_force or (args.mask and not args.dictionary_only)):
+                markov = cracker.train_markov(args.markov)
+            
+            result = cracker.crack(
+                use_dictionary=use_dictionary,
+                use_brute_force=use_brute_force,
+                mask=None if args.dictionary_only else args.mask,
+                custom_charsets=custom_charsets,
+                checkpoint_file=args.checkpoint,
+                wordlist=args.wordlist,
+                rules=rules,
+                tables=tables,
+                markov=markov
+            )
+            
+            if cracker.multi_target:
+                if cracker.results:
+                    print(f"\n🎉 SUCCESS! Cracked {len(cracker.results):,} hashes")
+            elif result:
+                print(f"\n🎉 SUCCESS! Password: '{display_password(result)}'")
+            
+        except KeyboardInterrupt:
+            print("\n\n🛑 Cracking interrupted by user")
+        except Exception as e:
+            print(f"\n❌ Error: {e}")
+    finally:
+        # Release the tables' memory maps and the potfile descriptor
+        for table in tables:
+            table.close()
+        if potfile is not None:
+            potfile.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
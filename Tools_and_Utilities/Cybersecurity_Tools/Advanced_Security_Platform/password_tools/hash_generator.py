@@ -6,15 +6,83 @@ FOR EDUCATIONAL PURPOSES ONLY
 
 import hashlib
 import argparse
+import collections
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HASH_FUNCTIONS = {
+    'md5': hashlib.md5,
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256,
+    'sha512': hashlib.sha512
+}
+
+# Wordlist input is handed to workers in newline-aligned blocks of about this size
+BULK_BLOCK_SIZE = 1 << 20
+
+# Characters that force a CSV field to be quoted
+CSV_SPECIAL = (',', '"', '\n', '\r')
+
+
+def read_blocks(stream, block_size=BULK_BLOCK_SIZE):
+    """Yield chunks of whole lines (bytes) from a binary stream without reading it all"""
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            return
+        if not block.endswith(b'\n'):
+            block += stream.readline()  # finish the line cut by the block boundary
+        yield block
+
+
+def hash_block(block, algorithms, output_format):
+    """
+    Hash every line of a block once per algorithm and return the formatted
+    CSV or JSONL rows as one bytes object (runs in a worker process), the row
+    count and how many lines were written as $HEX[...] because they are not
+    valid UTF-8 or already look like $HEX[...] (the hex form always names
+    exactly the bytes that were hashed).
+    """
+    hash_funcs = [HASH_FUNCTIONS[algorithm] for algorithm in algorithms]
+    # Hex digests never need escaping, so JSON rows are assembled from fixed pieces
+    json_keys = [f', "{algorithm}": "' for algorithm in algorithms]
+    rows = []
+    hex_lines = 0
+    
+    for line in block.split(b'\n'):
+        line = line.rstrip(b'\r')
+        if not line:
+            continue
+        digests = [hash_func(line).hexdigest() for hash_func in hash_funcs]
+        try:
+            text = line.decode('utf-8')
+        except UnicodeDecodeError:
+            text = None
+        if text is None or (text.startswith('$HEX[') and text.endswith(']')):
+            text = f"$HEX[{line.hex()}]"  # same convention as the hash cracker's potfile
+            hex_lines += 1
+        
+        if output_format == 'jsonl':
+            fields = ''.join(key + digest + '"' for key, digest in zip(json_keys, digests))
+            if text.isprintable() and '"' not in text and '\\' not in text:
+                quoted = '"' + text + '"'  # nothing to escape (the common case)
+            else:
+                quoted = json.dumps(text, ensure_ascii=False)
+            rows.append('{"password": ' + quoted + fields + '}')
+        else:
+            if any(char in text for char in CSV_SPECIAL):
+                text = '"' + text.replace('"', '""') + '"'
+            rows.append(','.join([text] + digests))
+    
+    rows.append('')
+    return '\n'.join(rows).encode('utf-8'), len(rows) - 1, hex_lines
 
 class HashGenerator:
     def __init__(self):
-        self.hash_functions = {
-            'md5': hashlib.md5,
-            'sha1': hashlib.sha1,
-            'sha256': hashlib.sha256,
-            'sha512': hashlib.sha512
-        }
+        self.hash_functions = HASH_FUNCTIONS
     
     def generate_hash(self, text, algorithm='md5'):
         """Generate hash for given text"""
@@ -39,15 +107,95 @@ class HashGenerator:
                 hash_value = self.generate_hash(password, algorithm)
                 print(f"'{password}' ({algorithm.upper()}): {hash_value}")
             print()
+    
+    def generate_bulk(self, wordlist, output, algorithms=('md5',), output_format='csv',
+                      workers=None):
+        """
+        Hash every line of a wordlist ('-' for stdin) under several algorithms
+        in one streaming pass. Blocks of lines are hashed and formatted by a
+        process pool and written to output ('-' for stdout) in input order,
+        with only a few blocks in memory at a time.
+        Returns the number of lines hashed.
+        """
+        for algorithm in algorithms:
+            if algorithm not in self.hash_functions:
+                raise ValueError(f"Unsupported algorithm: {algorithm}")
+        
+        workers = workers or os.cpu_count() or 1
+        window = workers * 4
+        lines = 0
+        hex_lines = 0
+        start_time = time.time()
+        
+        source = sys.stdin.buffer if wordlist == '-' else open(wordlist, 'rb')
+        target = sys.stdout.buffer if output == '-' else open(output, 'wb', buffering=1 << 20)
+        
+        try:
+            if output_format == 'csv':
+                target.write((','.join(['password'] + list(algorithms)) + '\n').encode())
+            
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = collections.deque()
+                for block in read_blocks(source):
+                    pending.append(executor.submit(hash_block, block, algorithms, output_format))
+                    if len(pending) >= window:
+                        data, count, hexed = pending.popleft().result()
+                        target.write(data)
+                        lines += count
+                        hex_lines += hexed
+                
+                while pending:
+                    data, count, hexed = pending.popleft().result()
+                    target.write(data)
+                    lines += count
+                    hex_lines += hexed
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+            if target is sys.stdout.buffer:
+                target.flush()
+            else:
+                target.close()
+        
+        elapsed = time.time() - start_time
+        rate = lines / elapsed if elapsed > 0 else 0
+        print(f"✅ Hashed {lines:,} lines x {len(algorithms)} algorithms in {elapsed:.2f} seconds "
+              f"({rate:,.0f} lines/s, {workers} workers)", file=sys.stderr)
+        if hex_lines:
+            print(f"⚠️  {hex_lines:,} lines written as $HEX[...] (not UTF-8 or $HEX-like)",
+                  file=sys.stderr)
+        return lines
 
 def main():
-    parser = argparse.ArgumentParser(description="Educational Hash Generator")
+    parser = argparse.ArgumentParser(
+        description="Educational Hash Generator",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python hash_generator.py hello --algorithm sha256
+  python hash_generator.py --test-hashes
+  
+  # Hash a whole wordlist under several algorithms (CSV or JSONL fixture)
+  python hash_generator.py --wordlist rockyou.txt --algorithms md5,sha1,sha256 -o fixture.csv
+  python hash_generator.py --wordlist words.txt --algorithms md5 -o fixture.jsonl --workers 8
+        """
+    )
     parser.add_argument("text", nargs="?", help="Text to hash")
     parser.add_argument("--algorithm", "-a", default="md5",
                        choices=["md5", "sha1", "sha256", "sha512"],
                        help="Hash algorithm (default: md5)")
     parser.add_argument("--test-hashes", "-t", action="store_true",
                        help="Generate test hashes for common passwords")
+    parser.add_argument("--wordlist", "-W",
+                       help="Hash every line of this file ('-' for stdin) in bulk")
+    parser.add_argument("--algorithms", default="md5",
+                       help="Comma-separated algorithms for --wordlist (default: md5)")
+    parser.add_argument("--output", "-o", default="-",
+                       help="Bulk output file (default: stdout)")
+    parser.add_argument("--format", "-F", choices=["csv", "jsonl"],
+                       help="Bulk output format (default: from the output extension, else csv)")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count(),
+                       help=f"Worker processes for --wordlist (default: {os.cpu_count()})")
     
     args = parser.parse_args()
     
@@ -57,8 +205,24 @@ def main():
         generator.generate_test_hashes()
         return
     
+    if args.wordlist:
+        if args.wordlist != '-' and not os.path.exists(args.wordlist):
+            print(f"❌ Wordlist not found: {args.wordlist}")
+            return
+        algorithms = [algorithm.strip().lower() for algorithm in args.algorithms.split(',')
+                      if algorithm.strip()]
+        output_format = args.format or ('jsonl' if args.output.endswith('.jsonl') else 'csv')
+        try:
+            generator.generate_bulk(args.wordlist, args.output, algorithms, output_format,
+                                    args.workers)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+        except KeyboardInterrupt:
+            print("\n🛑 Bulk hashing interrupted by user", file=sys.stderr)
+        return
+    
     if not args.text:
-        print("❌ Please provide text to hash or use --test-hashes")
+        print("❌ Please provide text to hash or use --test-hashes / --wordlist")
         return
     
     try:
@@ -0,0 +1,83 @@
+"""
+Tests for hash_cracker.py
+Run with: python -m unittest test_hash_cracker
+"""
+
+import hashlib
+import os
+import tempfile
+import unittest
+
+from hash_cracker import HashCracker, Potfile, candidate_bytes, display_password, wordlist_range
+
+
+class NonUtf8PasswordTest(unittest.TestCase):
+    """A latin-1 wordlist entry must survive cracking and the potfile byte for byte"""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.wordlist = os.path.join(self.directory.name, 'latin1.txt')
+        self.potfile_path = os.path.join(self.directory.name, 'test.pot')
+        self.raw = 'café'.encode('latin-1')  # b'caf\xe9' - not valid UTF-8
+        with open(self.wordlist, 'wb') as f:
+            f.write(b'coffee\n' + self.raw + b'\ntea\n')
+        self.digest = hashlib.md5(self.raw).hexdigest()
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def test_wordlist_hit_keeps_raw_bytes(self):
+        potfile = Potfile(self.potfile_path)
+        try:
+            cracker = HashCracker(hash_value=self.digest, workers=1, potfile=potfile)
+            cracker.wordlist_attack(self.wordlist)
+        finally:
+            potfile.close()
+        
+        self.assertEqual(candidate_bytes(cracker.result), self.raw)
+        self.assertEqual(display_password(cracker.result), '$HEX[636166e9]')
+        with open(self.potfile_path, 'rb') as f:
+            self.assertEqual(f.read(), f"md5:{self.digest}:$HEX[636166e9]\n".encode())
+    
+    def test_potfile_reload_returns_raw_bytes(self):
+        potfile = Potfile(self.potfile_path)
+        potfile.add('md5', bytes.fromhex(self.digest), self.raw.decode('utf-8', 'surrogateescape'))
+        potfile.close()
+        
+        reloaded = Potfile(self.potfile_path)
+        try:
+            password = reloaded.lookup('md5', bytes.fromhex(self.digest))
+        finally:
+            reloaded.close()
+        self.assertEqual(candidate_bytes(password), self.raw)
+        self.assertEqual(hashlib.md5(candidate_bytes(password)).hexdigest(), self.digest)
+
+
+class WordlistRangeTest(unittest.TestCase):
+    """Repeated hits on one target must not end the scan before the other targets are tried"""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.targets = {hashlib.md5(word).digest() for word in (b'hello', b'world')}
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def scan(self, content, rules=None):
+        path = os.path.join(self.directory.name, 'words.txt')
+        with open(path, 'wb') as f:
+            f.write(content)
+        hits, _ = wordlist_range('md5', path, rules, 0, len(content), self.targets)
+        return dict(hits)
+    
+    def test_repeated_word(self):
+        hits = self.scan(b'hello\nhello\nworld\n')
+        self.assertEqual(set(hits), self.targets)
+    
+    def test_rules_mapping_words_to_the_same_candidate(self):
+        hits = self.scan(b'hello\nHello\nworld\n', rules=[':', 'l'])
+        self.assertEqual(sorted(hits.values()), ['hello', 'world'])
+
+
+if __name__ == '__main__':
+    unittest.main()